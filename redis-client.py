@@ -8,21 +8,39 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Connection options shared by TCP and unix-socket connections
+connection_kwargs = {
+    'username': os.environ.get('REDIS_USERNAME', 'default'),
+    'password': os.environ.get('REDIS_PASSWORD'),
+    'decode_responses': True,
+}
+
+# Prefer a unix-domain socket when Redis is co-located (skips the TCP stack)
+socket_path = os.environ.get('REDIS_SOCKET_PATH')
+if socket_path:
+    connection_kwargs['unix_socket_path'] = socket_path
+    endpoint = socket_path
+else:
+    endpoint = f"{os.environ.get('REDIS_HOST')}:{os.environ.get('REDIS_PORT')}"
+    connection_kwargs['host'] = os.environ.get('REDIS_HOST')
+    connection_kwargs['port'] = int(os.environ.get('REDIS_PORT'))
+
+# RESP3 client-side caching: GETs of the forwarder's map:* keys are served from
+# process memory and invalidated by server push messages (CLIENT TRACKING)
+if os.environ.get('REDIS_CLIENT_CACHE', 'false').lower() == 'true':
+    from redis.cache import CacheConfig
+    connection_kwargs['protocol'] = 3
+    connection_kwargs['cache_config'] = CacheConfig(max_size=int(os.environ.get('REDIS_CLIENT_CACHE_SIZE', '10000')))
+
 # Initialize Redis client with credentials from .env
-r = redis.Redis(
-    host=os.environ.get('REDIS_HOST'),
-    port=int(os.environ.get('REDIS_PORT')),
-    username=os.environ.get('REDIS_USERNAME', 'default'),
-    password=os.environ.get('REDIS_PASSWORD'),
-    decode_responses=True
-)
+r = redis.Redis(**connection_kwargs)
 
 # Test connection
 try:
     r.ping()
     print("Redis connection successful!")
-    print(f"Connected to: {os.environ.get('REDIS_HOST')}:{os.environ.get('REDIS_PORT')}")
+    print(f"Connected to: {endpoint}")
 except redis.ConnectionError as e:
     print(f"Redis connection failed: {e}")
 except Exception as e:
-    print(f"Unexpected error: {e}")
\ No newline at end of file
+    print(f"Unexpected error: {e}")
@@ -21,6 +21,11 @@ try:
 except ImportError:
     from multi_bot_config import MultiBotConfigManager
 
+try:
+    from ..utils.channel_names import ADMIN_SUFFIXES
+except ImportError:
+    from utils.channel_names import ADMIN_SUFFIXES
+
 # Load environment variables
 load_dotenv()
 
@@ -108,7 +113,7 @@ class ChannelDiscoveryManager:
             channel_name = channel.get("name", "")
             
             # Check if channel name ends with -admin or -admins
-            if channel_name.endswith("-admin") or channel_name.endswith("-admins"):
+            if channel_name.endswith(ADMIN_SUFFIXES):
                 admin_channels.append({
                     "id": channel["id"],
                     "name": channel_name,
@@ -246,7 +251,7 @@ class ChannelDiscoveryManager:
             return {}
 
 def main():
-    """Test the channel discovery system"""
+    """Run channel discovery and assignment; returns True if any assignments were made"""
     logging.basicConfig(level=logging.INFO)
     
     try:
@@ -263,9 +268,12 @@ def main():
             print("\n📊 Final Assignment Summary:")
             for bot_id, channel_ids in assignments.items():
                 print(f"Bot-{bot_id}: {len(channel_ids)} channels")
-        
+        return bool(assignments)
+
     except Exception as e:
         logger.error(f"Error: {e}")
+        return False
 
 if __name__ == "__main__":
-    main()
+    # The listener runs this module in a child process and checks the exit status
+    sys.exit(0 if main() else 1)
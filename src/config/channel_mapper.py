@@ -15,13 +15,23 @@ Usage:
 """
 
 import os
+import sys
 import json
 import requests
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import re
 from datetime import datetime
 from difflib import SequenceMatcher
 from dotenv import load_dotenv
 
+try:
+    from ..utils.channel_names import ADMIN_SUFFIXES
+except ImportError:
+    from utils.channel_names import ADMIN_SUFFIXES
+
 # Load environment variables
 load_dotenv()
 
@@ -233,7 +243,7 @@ class ChannelMapper:
                 channel_name = channel.get("name", "")
                 
                 # Check if channel name ends with -admin or -admins
-                if channel_name.endswith("-admin") or channel_name.endswith("-admins"):
+                if channel_name.endswith(ADMIN_SUFFIXES):
                     admin_channels.append({
                         "id": channel["id"],
                         "name": channel_name,
@@ -388,8 +398,9 @@ class ChannelMapper:
         
         # Load existing ignored channels if they exist
         try:
-            with open('data/channel_lists.json', 'r') as f:
-                existing_data = json.load(f)
+            with open('data/channel_lists.json', 'rb') as f:
+                raw = f.read()
+                existing_data = orjson.loads(raw) if orjson else json.loads(raw)
                 existing_ignored = existing_data.get('ignored_channels', [])
                 # Merge with existing ignored channels
                 channel_lists["ignored_channels"] = list(set(channel_lists["ignored_channels"] + existing_ignored))
@@ -397,8 +408,12 @@ class ChannelMapper:
             pass
         
         # Save updated channel lists
-        with open('data/channel_lists.json', 'w') as f:
-            json.dump(channel_lists, f, indent=2)
+        if orjson:
+            with open('data/channel_lists.json', 'wb') as f:
+                f.write(orjson.dumps(channel_lists, option=orjson.OPT_INDENT_2))
+        else:
+            with open('data/channel_lists.json', 'w') as f:
+                json.dump(channel_lists, f, indent=2)
         
         print(f"channel_lists.json updated:")
         print(f"Managed channels: {len(channel_lists['managed_channels'])}")
@@ -488,14 +503,14 @@ class ChannelMapper:
             return False
 
 def main():
-    """Main execution"""
+    """Main execution; returns True if the mapping completed"""
     if not os.environ.get("CLICKUP_API_TOKEN"):
         print("Error: CLICKUP_API_TOKEN environment variable not set")
-        return
+        return False
     
     if not os.environ.get("SLACK_BOT_TOKEN"):
         print("Error: SLACK_BOT_TOKEN environment variable not set")
-        return
+        return False
     
     try:
         mapper = ChannelMapper()
@@ -505,9 +520,12 @@ def main():
             print("\n All systems updated! The listener will automatically reload the new channel categorizations.")
         else:
             print("\n Mapping process failed. Please check the errors above.")
+        return success
             
     except Exception as e:
         print(f"Fatal error: {e}")
+        return False
 
 if __name__ == "__main__":
-    main()
+    # The listener runs this module in a child process and checks the exit status
+    sys.exit(0 if main() else 1)
@@ -22,10 +22,17 @@ import os
 import sys
 import time
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pytz
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional
+from zoneinfo import ZoneInfo
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
@@ -34,6 +41,8 @@ from slack_sdk.errors import SlackApiError
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 from config.multi_bot_config import MultiBotConfigManager
+from utils.slack_client import create_web_client
+from utils.slack_files import REHOST_FILES, rehost_files
 
 
 # ----------------------------------------------------------------------------
@@ -72,8 +81,11 @@ r = get_redis_connection()
 # ----------------------------------------------------------------------------
 # Logging
 # ----------------------------------------------------------------------------
-logging.basicConfig(level=logging.INFO)
+# LOG_LEVEL=WARNING in production skips the per-job INFO lines entirely
+logging.basicConfig(level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO))
 logger = logging.getLogger(__name__)
+# The SDK logs every request and response body at DEBUG; keep only its warnings
+logging.getLogger("slack_sdk").setLevel(logging.WARNING)
 
 
 # ----------------------------------------------------------------------------
@@ -84,7 +96,7 @@ multi_bot_manager = MultiBotConfigManager()
 bot_clients: Dict[int, WebClient] = {}
 for bot_id, cfg in multi_bot_manager.bot_configs.items():
     token = os.environ.get("SLACK_BOT_TOKEN") if str(bot_id) == os.environ.get("BOT_ID", "") else cfg.bot_token
-    bot_clients[bot_id] = WebClient(token=token)
+    bot_clients[bot_id] = create_web_client(token)
 
 
 # ----------------------------------------------------------------------------
@@ -93,68 +105,196 @@ for bot_id, cfg in multi_bot_manager.bot_configs.items():
 STREAM_JOBS = "forwarding:jobs"
 GROUP_NAME = "workers"
 CONSUMER_NAME = f"worker-{os.getpid()}"
-MAP_MSG_KEY = "map:msg:{channel_id}:{ts}"
-MAP_PARENT_KEY = "map:parent:{channel_id}:{parent_ts}"
 MAP_TTL_SEC = 7 * 24 * 3600  # 7 days
+RECLAIM_IDLE_MS = 60_000  # Pending jobs idle this long are taken over at startup
+RECLAIM_COUNT = 100
 
 
+EST = ZoneInfo("America/New_York")
+EST_FORMAT = '%Y-%m-%d %I:%M:%S %p %Z'
+
+
+# The same ts is formatted again for thread parents and edits, so results are memoized
+@lru_cache(maxsize=4096)
 def convert_to_est(ts: str) -> str:
-    utc_time = datetime.fromtimestamp(float(ts))
-    est = pytz.timezone('US/Eastern')
-    est_time = utc_time.astimezone(est)
-    return est_time.strftime('%Y-%m-%d %I:%M:%S %p %Z')
+    return datetime.fromtimestamp(float(ts), tz=EST).strftime(EST_FORMAT)
+
+
+# Per-source-channel message formatters; the channel header is baked in once
+_TMPL_CACHE: Dict[str, Callable[[str, str, str], str]] = {}
+
+
+def get_message_template(source_channel_name: str) -> Callable[[str, str, str], str]:
+    """Return the `(text, user, est_time) -> message` formatter for a source channel."""
+    tmpl = _TMPL_CACHE.get(source_channel_name)
+    if tmpl is None:
+        header = f"*From #{source_channel_name}*\n"
+
+        def tmpl(text: str, user: str, est_time: str, _header: str = header) -> str:
+            return f"{_header}{text}\n_Posted by <@{user}> at {est_time}_"
+
+        _TMPL_CACHE[source_channel_name] = tmpl
+    return tmpl
 
 
 def ensure_group():
+    """Create the consumer group and reclaim stale pending jobs in one round-trip.
+
+    XGROUP CREATE (with MKSTREAM) and the XAUTOCLAIM sweep are pipelined so worker
+    startup pays a single RTT. BUSYGROUP (group already exists) is expected and ignored.
+    Returns the list of (msg_id, fields) entries reclaimed from dead consumers.
+    """
     try:
-        r.xgroup_create(name=STREAM_JOBS, groupname=GROUP_NAME, id='$', mkstream=True)
-        logger.info(f"Created consumer group {GROUP_NAME} on stream {STREAM_JOBS}")
+        with r.pipeline(transaction=False) as pipe:
+            pipe.xgroup_create(name=STREAM_JOBS, groupname=GROUP_NAME, id='$', mkstream=True)
+            pipe.xautoclaim(STREAM_JOBS, GROUP_NAME, CONSUMER_NAME, RECLAIM_IDLE_MS, start_id='0-0', count=RECLAIM_COUNT)
+            created, claimed = pipe.execute(raise_on_error=False)
     except Exception as e:
-        # Group exists or other benign errors
-        pass
+        logger.error(f"Failed to initialise consumer group {GROUP_NAME}: {e}")
+        return []
+
+    if isinstance(created, Exception):
+        if "BUSYGROUP" not in str(created):
+            logger.error(f"XGROUP CREATE failed: {created}")
+    else:
+        logger.info(f"Created consumer group {GROUP_NAME} on stream {STREAM_JOBS}")
+
+    if isinstance(claimed, Exception):
+        logger.error(f"XAUTOCLAIM failed: {claimed}")
+        return []
+    # Reply is [next_start_id, [(id, fields), ...], (deleted_ids on Redis 7+)]
+    reclaimed = [(msg_id, fields) for msg_id, fields in claimed[1] if fields]
+    if reclaimed:
+        logger.info(f"Reclaimed {len(reclaimed)} pending jobs from idle consumers")
+    return reclaimed
 
 
 def get_client_for_bot(bot_id: int) -> WebClient:
-    if bot_id in bot_clients:
-        return bot_clients[bot_id]
+    client = bot_clients.get(bot_id)
+    if client is not None:
+        return client
     # Fallback to any available client
     return next(iter(bot_clients.values()))
 
 
+def map_msg_key(channel_id: str, ts: str) -> str:
+    # {channel_id} is wrapped in a hash tag so every mapping of one source channel lands
+    # in the same Redis Cluster slot and can be pipelined/MGET together
+    return f"map:msg:{{{channel_id}}}:{ts}"
+
+
+def map_parent_key(channel_id: str, parent_ts: str) -> str:
+    return f"map:parent:{{{channel_id}}}:{parent_ts}"
+
+
 def get_master_ts_for_message(channel_id: str, ts: str) -> Optional[str]:
     try:
-        key = MAP_MSG_KEY.format(channel_id=channel_id, ts=ts)
-        return r.get(key)
+        return r.get(map_msg_key(channel_id, ts))
     except Exception:
         return None
 
 
 def set_master_ts_for_message(channel_id: str, ts: str, master_ts: str) -> None:
     try:
-        key = MAP_MSG_KEY.format(channel_id=channel_id, ts=ts)
-        r.set(key, master_ts, ex=MAP_TTL_SEC)
+        r.set(map_msg_key(channel_id, ts), master_ts, ex=MAP_TTL_SEC)
     except Exception:
         pass
 
 
 def get_master_ts_for_parent(channel_id: str, parent_ts: str) -> Optional[str]:
     try:
-        key = MAP_PARENT_KEY.format(channel_id=channel_id, parent_ts=parent_ts)
-        return r.get(key)
+        return r.get(map_parent_key(channel_id, parent_ts))
     except Exception:
         return None
 
 
+# Placeholder stored under a parent's map key while one worker posts that parent.
+# The worker refreshes it every PARENT_PENDING_REFRESH_SEC for as long as the
+# post takes (timeouts, retries and Retry-After waits included), so it only
+# expires once that worker has died.
+PARENT_PENDING = "pending"
+PARENT_PENDING_TTL_SEC = 30
+PARENT_PENDING_REFRESH_SEC = PARENT_PENDING_TTL_SEC / 3
+
+# Take the parent map key for this worker; returns nil if it was free, else the
+# value already there (a master ts, or PARENT_PENDING while another worker posts)
+CLAIM_PARENT = r.register_script("""
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return false
+end
+return redis.call('GET', KEYS[1])
+""")
+
+# Extend this worker's claim while its post is still in flight
+REFRESH_PARENT = r.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+""")
+
+# Drop this worker's claim after a failed post, unless the key has moved on since
+RELEASE_PARENT = r.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+
+def claim_parent(channel_id: str, parent_ts: str) -> Optional[str]:
+    """Claim posting a parent; returns None if this worker should post it, else the value already stored."""
+    try:
+        return CLAIM_PARENT(keys=[map_parent_key(channel_id, parent_ts)], args=[PARENT_PENDING, PARENT_PENDING_TTL_SEC])
+    except Exception:
+        return None
+
+
+def keep_parent_claimed(channel_id: str, parent_ts: str, done: threading.Event) -> None:
+    """Refresh this worker's pending marker until done is set"""
+    while not done.wait(PARENT_PENDING_REFRESH_SEC):
+        try:
+            REFRESH_PARENT(keys=[map_parent_key(channel_id, parent_ts)], args=[PARENT_PENDING, PARENT_PENDING_TTL_SEC])
+        except Exception:
+            pass
+
+
+def release_parent(channel_id: str, parent_ts: str) -> None:
+    try:
+        RELEASE_PARENT(keys=[map_parent_key(channel_id, parent_ts)], args=[PARENT_PENDING])
+    except Exception:
+        pass
+
+
 def set_master_ts_for_parent(channel_id: str, parent_ts: str, master_ts: str) -> None:
     try:
-        key = MAP_PARENT_KEY.format(channel_id=channel_id, parent_ts=parent_ts)
-        r.set(key, master_ts, ex=MAP_TTL_SEC)
+        r.set(map_parent_key(channel_id, parent_ts), master_ts, ex=MAP_TTL_SEC)
     except Exception:
         pass
 
 
+def wait_for_parent(channel_id: str, parent_ts: str) -> Optional[str]:
+    """Wait for the worker posting this parent to store its ts; None if it gave up or died.
+
+    There is no deadline of its own: the marker stays for as long as its owner
+    keeps refreshing it, and lapses within PARENT_PENDING_TTL_SEC once it stops.
+    """
+    while True:
+        time.sleep(0.2)
+        master_parent_ts = get_master_ts_for_parent(channel_id, parent_ts)
+        if master_parent_ts != PARENT_PENDING:
+            return master_parent_ts
+
+
 def ensure_parent_posted(client: WebClient, payload: Dict[str, Any]) -> Optional[str]:
-    """Ensure the parent message is posted in the master channel, return parent master ts."""
+    """Ensure the parent message is posted in the master channel, return parent master ts.
+
+    Replies to the same new thread can reach several workers at once. The first
+    one to claim the parent's map key posts it, while the others wait for the
+    ts that worker stores, so the parent is posted once and every reply lands
+    in its thread. Returns None if the parent cannot be posted, in which case
+    the reply goes out unthreaded.
+    """
     source_channel_id = payload.get("source_channel_id", "")
     source_channel_name = payload.get("source_channel_name", "")
     target_channel_id = payload.get("target_channel_id", "")
@@ -164,27 +304,116 @@ def ensure_parent_posted(client: WebClient, payload: Dict[str, Any]) -> Optional
     if not thread_ts:
         return None
 
-    # Check cache
-    master_parent_ts = get_master_ts_for_parent(source_channel_id, thread_ts)
+    # One round trip: either the claim is ours, or it returns the stored ts (or marker)
+    master_parent_ts = claim_parent(source_channel_id, thread_ts)
+    if master_parent_ts == PARENT_PENDING:
+        return wait_for_parent(source_channel_id, thread_ts)
     if master_parent_ts:
         return master_parent_ts
 
-    # Fetch original parent message
+    done = threading.Event()
+    threading.Thread(target=keep_parent_claimed, args=(source_channel_id, thread_ts, done),
+                     daemon=True, name="parent-claim").start()
+    master_parent_ts = None
+    # Fetch original parent message. replies lists the thread's parent first and,
+    # unlike history with latest=thread_ts, never returns an older message when the
+    # parent has been deleted.
     try:
-        hist = client.conversations_history(channel=source_channel_id, latest=thread_ts, limit=1, inclusive=True)
-        if not hist.get("messages"):
+        thread = client.conversations_replies(channel=source_channel_id, ts=thread_ts, limit=1)
+        if not thread.get("messages"):
             return None
-        original_msg = hist["messages"][0]
-        parent_ts = original_msg["ts"]
+        original_msg = thread["messages"][0]
         parent_text = original_msg.get("text", "")
-        parent_message = f"*From #{source_channel_name}*\n{parent_text}\n_Posted by <@{original_msg.get('user','unknown')}> at {convert_to_est(parent_ts)}_"
+        parent_message = get_message_template(source_channel_name)(parent_text, original_msg.get('user', 'unknown'), convert_to_est(original_msg["ts"]))
         parent_resp = client.chat_postMessage(channel=target_channel_id, text=parent_message)
         master_parent_ts = parent_resp["ts"]
-        set_master_ts_for_parent(source_channel_id, parent_ts, master_parent_ts)
+        set_master_ts_for_parent(source_channel_id, thread_ts, master_parent_ts)
         return master_parent_ts
     except SlackApiError as e:
-        logger.error(f"Error ensuring parent posted: {e.response['error']}")
+        if e.response['error'] != "thread_not_found":
+            logger.error("Error ensuring parent posted: %s", e.response['error'])
         return None
+    finally:
+        done.set()
+        if master_parent_ts is None:
+            # Let the next reply in this thread try again
+            release_parent(source_channel_id, thread_ts)
+
+
+def call_slack(method: Callable[..., Any], params: Dict[str, Any], method_name: str) -> Optional[Any]:
+    """Invoke a Slack API method with the prebuilt `params`; returns the response or None (logged).
+
+    Retries live in the client alone: create_web_client retries connection
+    resets, backs off on Slack server errors and waits out Retry-After on 429s,
+    so a failure that reaches here is final. Retrying again on top of that multiplied the attempts and could
+    post the same message twice.
+    """
+    try:
+        return method(**params)
+    except SlackApiError as e:
+        err = e.response.get('error') if e.response is not None else str(e)
+        if err in ("ratelimited", "rate_limited"):
+            logger.error("%s still rate limited after retries, giving up: %s", method_name, err)
+        else:
+            logger.error("%s failed: %s", method_name, err)
+        return None
+
+
+# File fields needed to build an attachment card
+FILE_FIELDS = frozenset(("name", "url_private", "mimetype"))
+
+# Runs files_info lookups side by side when one job has several incomplete files
+files_info_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="files-info")
+
+
+def fetch_file_info(client: WebClient, file_id: str) -> Optional[Dict[str, Any]]:
+    """Return the files_info "file" object, or None (logged) if Slack refuses it"""
+    try:
+        return client.files_info(file=file_id)["file"]
+    except SlackApiError as e:
+        logger.error("Error handling file: %s", e.response['error'])
+        return None
+
+
+def resolve_files(client: WebClient, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the shared files with name/url_private/mimetype, dropping any Slack refuses.
+
+    Message events already carry those fields on each file, so files_info is only
+    called for a file whose payload lacks them; several such files are looked up
+    concurrently.
+    """
+    missing = [file["id"] for file in files if not FILE_FIELDS.issubset(file)]
+    if len(missing) > 1:
+        fetched = dict(zip(missing, files_info_pool.map(lambda file_id: fetch_file_info(client, file_id), missing)))
+    else:
+        fetched = {file_id: fetch_file_info(client, file_id) for file_id in missing}
+
+    resolved = []
+    for file in files:
+        if file["id"] in fetched:
+            file = fetched[file["id"]]
+            if file is None:
+                continue
+        resolved.append(file)
+    return resolved
+
+
+def build_file_attachments(files: List[Dict[str, Any]], user: str, ts: str) -> List[Dict[str, Any]]:
+    """Build one attachment card per resolved file"""
+    cards = []
+    for file in files:
+        name, url = file["name"], file["url_private"]
+        card = {
+            "fallback": f"File: {name}",
+            "title": name,
+            "title_link": url,
+            "text": f"File shared by <@{user}>",
+            "ts": ts,
+        }
+        if file["mimetype"].startswith("image/"):
+            card["image_url"] = url
+        cards.append(card)
+    return cards
 
 
 def handle_post_job(client: WebClient, payload: Dict[str, Any]) -> None:
@@ -201,12 +430,16 @@ def handle_post_job(client: WebClient, payload: Dict[str, Any]) -> None:
 
     # Build message
     est_time_str = convert_to_est(ts) if ts else ""
-    message = f"*From #{source_channel_name}*\n{text}\n_Posted by <@{user}> at {est_time_str}_"
+    message = get_message_template(source_channel_name)(text, user, est_time_str)
     params: Dict[str, Any] = {"channel": target_channel_id, "text": message}
 
-    # Try to append attachments (if already normalized)
-    if attachments:
-        params["attachments"] = attachments
+    # File cards first, then the source message's own attachments. With
+    # REHOST_FILES the files are uploaded after the post instead of carded.
+    shared_files = resolve_files(client, files) if files else []
+    message_attachments = [] if REHOST_FILES else build_file_attachments(shared_files, user, ts)
+    message_attachments.extend(attachments)
+    if message_attachments:
+        params["attachments"] = message_attachments
 
     # Handle thread linkage
     if is_thread_reply and thread_ts:
@@ -214,32 +447,18 @@ def handle_post_job(client: WebClient, payload: Dict[str, Any]) -> None:
         if master_parent_ts:
             params["thread_ts"] = master_parent_ts
 
-    # Post with retries
-    backoff = 1.0
-    for attempt in range(4):
+    resp = call_slack(client.chat_postMessage, params, "chat_postMessage")
+    if resp is None:
+        return
+    if ts:
+        set_master_ts_for_message(source_channel_id, ts, resp["ts"])
+    logger.info("Posted message to %s from #%s", target_channel_id, source_channel_name)
+
+    if REHOST_FILES and shared_files:
         try:
-            resp = client.chat_postMessage(**params)
-            master_ts = resp["ts"]
-            if ts:
-                set_master_ts_for_message(source_channel_id, ts, master_ts)
-            logger.info(f"Posted message to {target_channel_id} from #{source_channel_name}")
-            return
+            rehost_files(client, shared_files, target_channel_id, params.get("thread_ts"), files_info_pool)
         except SlackApiError as e:
-            err = e.response.get('error') if hasattr(e, 'response') and e.response is not None else str(e)
-            retry_after = None
-            try:
-                retry_after = int(e.response.headers.get('Retry-After', '0')) if hasattr(e, 'response') and e.response is not None else 0
-            except Exception:
-                retry_after = 0
-            if retry_after and retry_after > 0:
-                time.sleep(retry_after)
-                continue
-            if err in ("ratelimited", "rate_limited", "internal_error", "unknown_error") and attempt < 3:
-                time.sleep(backoff)
-                backoff *= 2
-                continue
-            logger.error(f"chat_postMessage failed (no retry): {err}")
-            return
+            logger.error("Error uploading files from #%s: %s", source_channel_name, e.response['error'])
 
 
 def handle_update_job(client: WebClient, payload: Dict[str, Any]) -> None:
@@ -250,33 +469,13 @@ def handle_update_job(client: WebClient, payload: Dict[str, Any]) -> None:
 
     master_ts = get_master_ts_for_message(source_channel_id, ts)
     if not master_ts:
-        logger.warning(f"No master ts mapping for update {source_channel_id}:{ts}")
+        logger.warning("No master ts mapping for update %s:%s", source_channel_id, ts)
         return
 
     params: Dict[str, Any] = {"channel": target_channel_id, "ts": master_ts, "text": text}
 
-    backoff = 1.0
-    for attempt in range(4):
-        try:
-            client.chat_update(**params)
-            logger.info(f"Updated message in {target_channel_id}")
-            return
-        except SlackApiError as e:
-            err = e.response.get('error') if hasattr(e, 'response') and e.response is not None else str(e)
-            retry_after = None
-            try:
-                retry_after = int(e.response.headers.get('Retry-After', '0')) if hasattr(e, 'response') and e.response is not None else 0
-            except Exception:
-                retry_after = 0
-            if retry_after and retry_after > 0:
-                time.sleep(retry_after)
-                continue
-            if err in ("ratelimited", "rate_limited", "internal_error", "unknown_error") and attempt < 3:
-                time.sleep(backoff)
-                backoff *= 2
-                continue
-            logger.error(f"chat_update failed (no retry): {err}")
-            return
+    if call_slack(client.chat_update, params, "chat_update") is not None:
+        logger.info("Updated message in %s", target_channel_id)
 
 
 def parse_stream_message(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -285,7 +484,7 @@ def parse_stream_message(data: Dict[str, Any]) -> Dict[str, Any]:
     for k, v in data.items():
         if k in ("attachments", "files"):
             try:
-                parsed[k] = json.loads(v)
+                parsed[k] = orjson.loads(v) if orjson else json.loads(v)
             except Exception:
                 parsed[k] = []
         elif k in ("is_thread_reply",):
@@ -300,9 +499,28 @@ def parse_stream_message(data: Dict[str, Any]) -> Dict[str, Any]:
     return parsed
 
 
+def process_job(msg_id: str, fields: Dict[str, Any]) -> None:
+    payload = parse_stream_message(fields)
+    bot_id = payload.get("bot_id", 1)
+    client = get_client_for_bot(bot_id)
+    job_type = payload.get("type", "post")
+    try:
+        if job_type == "update":
+            handle_update_job(client, payload)
+        else:
+            handle_post_job(client, payload)
+        r.xack(STREAM_JOBS, GROUP_NAME, msg_id)
+    except Exception as e:
+        logger.error("Unhandled worker error: %s", e)
+        # Acknowledge to prevent blocking the PEL; alternatively, move to DLQ
+        r.xack(STREAM_JOBS, GROUP_NAME, msg_id)
+
+
 def main():
-    ensure_group()
+    reclaimed = ensure_group()
     logger.info(f"Worker started. Group={GROUP_NAME} Consumer={CONSUMER_NAME}")
+    for msg_id, fields in reclaimed:
+        process_job(msg_id, fields)
     while True:
         try:
             resp = r.xreadgroup(groupname=GROUP_NAME, consumername=CONSUMER_NAME, streams={STREAM_JOBS: '>'}, count=10, block=5000)
@@ -310,20 +528,7 @@ def main():
                 continue
             for stream_key, messages in resp:
                 for msg_id, fields in messages:
-                    payload = parse_stream_message(fields)
-                    bot_id = payload.get("bot_id", 1)
-                    client = get_client_for_bot(bot_id)
-                    job_type = payload.get("type", "post")
-                    try:
-                        if job_type == "update":
-                            handle_update_job(client, payload)
-                        else:
-                            handle_post_job(client, payload)
-                        r.xack(STREAM_JOBS, GROUP_NAME, msg_id)
-                    except Exception as e:
-                        logger.error(f"Unhandled worker error: {e}")
-                        # Acknowledge to prevent blocking the PEL; alternatively, move to DLQ
-                        r.xack(STREAM_JOBS, GROUP_NAME, msg_id)
+                    process_job(msg_id, fields)
         except Exception as loop_err:
             logger.error(f"Worker loop error: {loop_err}")
             time.sleep(1)
@@ -5,14 +5,23 @@ import os
 import sys
 import logging
 import json
-import hashlib
+from hashlib import blake2b
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import atexit
+import signal
 from datetime import datetime, timedelta
-import pytz
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 import threading
 import time
-import subprocess
 import redis
-from slack_sdk import WebClient
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import NamedTuple, Optional, Tuple
 from slack_sdk.errors import SlackApiError
 
 from slack_bolt import App
@@ -23,11 +32,21 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'
 
 # Import multi-bot architecture components
 from config.multi_bot_config import MultiBotConfigManager
-from config.channel_discovery import ChannelDiscoveryManager
+from utils.cache import LRUCache, PersistentLRUCache
+from utils.channel_names import ADMIN_SUFFIXES, AGENT_SUFFIXES, APPTBK_SUFFIXES
+from utils.client_list_schedule import run_client_list_scheduler
+from utils.config_jobs import run_config_job
+from utils.master_channels import get_joined_channels, validate_master_channels as check_master_channels
+from utils.slack_client import create_web_client
+from utils.slack_files import REHOST_FILES, rehost_files
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+# LOG_LEVEL=WARNING in production skips the per-message INFO lines entirely
+logging.basicConfig(level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO))
 logger = logging.getLogger(__name__)
+# The SDK logs every request and response body at DEBUG, so LOG_LEVEL=DEBUG would
+# otherwise be dominated by it; keep only its warnings
+logging.getLogger("slack_sdk").setLevel(logging.WARNING)
 
 # Initialize multi-bot configuration
 # NOTE: This is initialized AFTER BOT_ID environment variable is set by multi_bot_launcher
@@ -36,8 +55,14 @@ current_bot_config = multi_bot_manager.get_current_bot_config()
 
 # Initialize Slack clients with current bot's tokens
 # Use the tokens from the environment variables set by multi_bot_launcher
-client = WebClient(token=os.environ.get("SLACK_BOT_TOKEN", current_bot_config.bot_token))
-app = App(token=os.environ.get("SLACK_BOT_TOKEN", current_bot_config.bot_token))
+client = create_web_client(os.environ.get("SLACK_BOT_TOKEN", current_bot_config.bot_token))
+# Bolt shares the same client (and its SSL context) instead of building its own
+app = App(client=client)
+
+# Shared pool for independent Slack calls made while forwarding a single message
+# (e.g. files_info for every file in a multi-file share). WebClient is thread-safe.
+SLACK_IO_WORKERS = int(os.environ.get("SLACK_IO_WORKERS", "8"))
+slack_io_pool = ThreadPoolExecutor(max_workers=SLACK_IO_WORKERS, thread_name_prefix="slack-io")
 
 logger.info(f"🤖 Multi-bot configuration:")
 logger.info(f"   • Total bots: {len(multi_bot_manager.bot_configs)}")
@@ -55,30 +80,74 @@ APPTBK_MASTER_CHANNEL_ID = os.environ.get("APPTBK_MASTER_CHANNEL_ID", "C0953PV5Z
 MANAGED_ADMIN_MASTER_CHANNEL_ID = os.environ.get("MANAGED_ADMIN_MASTER_CHANNEL_ID")
 STORM_ADMIN_MASTER_CHANNEL_ID = os.environ.get("STORM_ADMIN_MASTER_CHANNEL_ID")
 
+# Every configured master channel; unset IDs are left out
+MASTER_CHANNEL_IDS = frozenset(
+    channel_id for channel_id in (
+        AGENT_MASTER_CHANNEL_ID, APPTBK_MASTER_CHANNEL_ID,
+        MANAGED_ADMIN_MASTER_CHANNEL_ID, STORM_ADMIN_MASTER_CHANNEL_ID,
+    ) if channel_id
+)
+
+# Message subtypes that carry nothing to forward: deletions, and the bookkeeping
+# copy Slack sends when a message gets a thread reply. Edits (message_changed)
+# are handed to handle_message_edit instead.
+SKIPPED_SUBTYPES = frozenset(("message_deleted", "message_replied"))
+
+# Every source channel suffix the listener forwards from, and its kind
+TARGET_SUFFIXES = ADMIN_SUFFIXES + AGENT_SUFFIXES + APPTBK_SUFFIXES
+SUFFIX_TO_KIND = (
+    {suffix: "admin" for suffix in ADMIN_SUFFIXES}
+    | {suffix: "agent" for suffix in AGENT_SUFFIXES}
+    | {suffix: "apptbk" for suffix in APPTBK_SUFFIXES}
+)
+
+def channel_kind(channel_name):
+    """Return "admin", "agent", "apptbk" or None based on the channel name suffix"""
+    _, dash, suffix = channel_name.rpartition("-")
+    return SUFFIX_TO_KIND.get(dash + suffix)
+
 # Load channel categorizations
+# (st_mtime_ns, st_size) of channel_lists.json and the categorizations parsed from it
+_channel_lists_stamp = None
+_channel_lists_loaded = None
+
 def load_channel_categorizations():
-    """Load channel categorizations from JSON file"""
+    """Load channel categorizations from JSON file.
+
+    The sets are frozen so a loaded dict can be swapped into CHANNEL_CATEGORIZATIONS
+    with a single rebind and read from handler threads without locking. If the file
+    is unchanged since the last load, that same dict is returned without re-parsing,
+    which also keeps the per-name routing memo in channel_route() valid.
+    """
+    global _channel_lists_stamp, _channel_lists_loaded
     try:
-        with open('data/channel_lists.json', 'r') as f:
-            data = json.load(f)
-            return {
-                'managed_channels': set(data.get('managed_channels', [])),
-                'storm_channels': set(data.get('storm_channels', [])),
-                'ignored_channels': set(data.get('ignored_channels', []))
+        with open('data/channel_lists.json', 'rb') as f:
+            st = os.fstat(f.fileno())
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == _channel_lists_stamp:
+                return _channel_lists_loaded
+            raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            loaded = {
+                'managed_channels': frozenset(data.get('managed_channels', [])),
+                'storm_channels': frozenset(data.get('storm_channels', [])),
+                'ignored_channels': frozenset(data.get('ignored_channels', []))
             }
+            _channel_lists_stamp, _channel_lists_loaded = stamp, loaded
+            return loaded
     except FileNotFoundError:
         logger.warning("channel_lists.json not found, using default categorizations")
         return {
-            'managed_channels': set(),
-            'storm_channels': set(),
-            'ignored_channels': set(["ccdocs-admin", "test-admins"])
+            'managed_channels': frozenset(),
+            'storm_channels': frozenset(),
+            'ignored_channels': frozenset(["ccdocs-admin", "test-admins"])
         }
 
 # Load channel categorizations
 CHANNEL_CATEGORIZATIONS = load_channel_categorizations()
 
 # Channels to ignore - these are the channel names to ignore completely
-IGNORED_CHANNEL_NAMES = [
+IGNORED_CHANNEL_NAMES = frozenset([
     "ccdocs-agents", 
     "ccdocs-admin", 
     "ccdocs-apptbk",
@@ -86,7 +155,7 @@ IGNORED_CHANNEL_NAMES = [
     "building-universal-agents",
     "master-agent", 
     "master-admin-storm"
-]
+])
 
 # Initialize Redis client for cross-process message deduplication
 # All bot processes share this Redis cache for true first-responder architecture
@@ -108,9 +177,47 @@ except Exception as e:
     logger.warning("⚠️ Falling back to in-memory cache (duplicates may occur across processes)")
     redis_client = None
 
-# Fallback in-memory cache (only used if Redis fails)
-processed_messages_cache = {}
-cache_lock = threading.Lock()
+# Fallback in-memory dedup (only used if Redis fails). Claims expire after the same
+# 5 minutes as the Redis keys; the keys are spread over shards, each with its own
+# lock, so handler threads claiming different messages rarely contend.
+PROCESSED_SHARDS = 16
+processed_messages_shards = [LRUCache(maxsize=4096, ttl=300) for _ in range(PROCESSED_SHARDS)]
+
+def fallback_message_id(channel_id, message):
+    """Deterministic 16-hex-digit id for a message without client_msg_id.
+
+    Built from the channel, author and first 50 characters; every bot must derive
+    the same id for the claim to dedup across processes.
+    """
+    event_signature = f"{channel_id}:{message.get('user', 'bot')}:{message.get('text', '')[:50]}"
+    return blake2b(event_signature.encode(), digest_size=8).hexdigest()
+
+def claim_locally(message_key):
+    """Claim message_key in this process; False if it was already claimed"""
+    return processed_messages_shards[hash(message_key) % PROCESSED_SHARDS].add(message_key)
+
+# (channel_id, event_ts) of events already handled by this process. Slack redelivers
+# an event whose ack arrived late, and this drops the repeat before any dedup or
+# Slack lookups
+seen_events = LRUCache(maxsize=10_000, ttl=600)
+
+def update_basic_client_lists():
+    """Fallback when channel mapping fails: refresh the client lists straight from ClickUp"""
+    logger.info("🔄 Falling back to basic client list update...")
+    try:
+        from utils.clickup_client_fetcher import ClientListGenerator
+        
+        generator = ClientListGenerator()
+        client_lists = generator.fetch_client_lists()
+        
+        if client_lists:
+            generator.save_client_lists(client_lists)
+            logger.info("✅ Basic client lists updated as fallback")
+        else:
+            logger.warning("⚠️ No client data found in fallback")
+            
+    except Exception as fallback_error:
+        logger.error(f"❌ Fallback client update also failed: {fallback_error}")
 
 def update_client_lists():
     """Update client lists, channel mappings, and bot assignments"""
@@ -121,10 +228,7 @@ def update_client_lists():
         if current_bot_config.bot_id == 1:
             logger.info("🔍 Running channel discovery and assignment (Bot 1 responsibility)...")
             try:
-                discovery_manager = ChannelDiscoveryManager(multi_bot_manager)
-                assignments = discovery_manager.run_full_discovery()
-                
-                if assignments:
+                if run_config_job("config.channel_discovery"):
                     logger.info("✅ Channel discovery and assignment completed")
                 else:
                     logger.warning("⚠️ Channel discovery failed")
@@ -137,35 +241,16 @@ def update_client_lists():
         if current_bot_config.bot_id == 1:
             logger.info("🗺️ Running channel mapping (Bot 1 responsibility)...")
             try:
-                from config.channel_mapper import ChannelMapper
-                
-                mapper = ChannelMapper()
-                success = mapper.run_full_mapping()
-                
-                if success:
+                if run_config_job("config.channel_mapper"):
                     logger.info("✅ Channel mapping completed successfully")
                 else:
+                    # The mapper runs in a child process, so its failures arrive here
                     logger.warning("⚠️ Channel mapping failed")
+                    update_basic_client_lists()
                     
             except Exception as mapping_error:
                 logger.warning(f"⚠️ Channel mapping failed: {mapping_error}")
-                
-                # Fallback to basic client list update
-                logger.info("🔄 Falling back to basic client list update...")
-                try:
-                    from utils.clickup_client_fetcher import ClientListGenerator
-                    
-                    generator = ClientListGenerator()
-                    client_lists = generator.fetch_client_lists()
-                    
-                    if client_lists:
-                        generator.save_client_lists(client_lists)
-                        logger.info("✅ Basic client lists updated as fallback")
-                    else:
-                        logger.warning("⚠️ No client data found in fallback")
-                        
-                except Exception as fallback_error:
-                    logger.error(f"❌ Fallback client update also failed: {fallback_error}")
+                update_basic_client_lists()
         else:
             logger.info(f"⏭️ Skipping channel mapping (Bot {current_bot_config.bot_id} - only Bot 1 handles mapping)")
         
@@ -173,6 +258,7 @@ def update_client_lists():
         logger.info("🔄 Reloading channel categorizations...")
         global CHANNEL_CATEGORIZATIONS
         CHANNEL_CATEGORIZATIONS = load_channel_categorizations()
+        seed_channel_names()
         
         # Step 4: All bots reload their channel assignments
         multi_bot_manager._load_channel_assignments()
@@ -188,31 +274,162 @@ def update_client_lists():
     except Exception as e:
         logger.error(f"❌ Exception during channel mapping update: {str(e)}")
 
+# Set to stop the scheduler thread promptly instead of waiting out its sleep
+scheduler_stop = threading.Event()
+
 def client_list_scheduler():
-    """Background scheduler to update client lists and channel mappings every 12 hours"""
-    logger.info("🕐 Channel mapping scheduler started - will update every 12 hours")
-    
-    # Run initial update
-    update_client_lists()
-    
-    while True:
+    """Background scheduler to update client lists and channel mappings at fixed UTC times"""
+    run_client_list_scheduler(update_client_lists, scheduler_stop, leader=current_bot_config.bot_id == 1)
+
+# Store message IDs to track edits and thread relationships, keyed by (channel_id, ts)
+# Bounded so a long-running process does not keep every forwarded message forever;
+# old parents rarely get new replies or edits
+TRACKER_MAX_SIZE = int(os.environ.get("TRACKER_MAX_SIZE", "50000"))
+TRACKER_TTL = int(os.environ.get("TRACKER_TTL", str(30 * 24 * 60 * 60)))
+
+class MessageEvent(NamedTuple):
+    """A source message (or edit) queued for forwarding, built once by the event handler"""
+    channel_id: str
+    channel_name: str  # resolved once by the handler and reused down the forward path
+    text: str
+    user: str
+    timestamp: str
+    message_ts: Optional[str] = None  # master-channel ts to update, for edits
+    thread_ts: Optional[str] = None
+    is_thread_reply: bool = False
+    attachments: Tuple = ()
+    files: Tuple = ()
+
+class TrackedMsg(NamedTuple):
+    """Where a source message was forwarded to (a plain tuple, so no per-entry __dict__)"""
+    ts: str
+    target_channel: str
+
+# SQLite file the message tracker writes through to, so edits and thread replies to
+# messages forwarded before a restart still find their master-channel post; set
+# TRACKER_DB to an empty string to keep the tracker in memory only
+TRACKER_DB = os.environ.get("TRACKER_DB", "data/message_tracker.db")
+
+if TRACKER_DB:
+    message_tracker = PersistentLRUCache(
+        maxsize=TRACKER_MAX_SIZE, path=TRACKER_DB, table="message_tracker",
+        ttl=TRACKER_TTL, value_type=TrackedMsg
+    )
+else:
+    message_tracker = LRUCache(maxsize=TRACKER_MAX_SIZE, ttl=TRACKER_TTL)
+
+# Expired rows are only skipped on read, so the table is swept on this interval too
+TRACKER_SWEEP_INTERVAL = 6 * 60 * 60
+
+def tracker_sweeper():
+    """Delete expired rows from TRACKER_DB every TRACKER_SWEEP_INTERVAL until shutdown"""
+    while not scheduler_stop.wait(TRACKER_SWEEP_INTERVAL):
         try:
-            # Calculate next update time
-            next_update = datetime.now() + timedelta(hours=12)
-            logger.info(f"⏰ Next channel mapping update scheduled for: {next_update.strftime('%Y-%m-%d %I:%M:%S %p')}")
-            
-            # Wait 12 hours (43200 seconds)
-            time.sleep(43200)
-            update_client_lists()
+            removed = message_tracker.sweep()
+            if removed:
+                logger.info("🧹 Swept %d expired message tracker rows", removed)
         except Exception as e:
-            logger.error(f"❌ Error in client list scheduler: {str(e)}")
-            # Wait 1 hour before retrying if there's an error
-            logger.info("⏰ Retrying in 1 hour due to error...")
-            time.sleep(3600)
+            logger.warning("Could not sweep the message tracker: %s", e)
+
+thread_tracker = LRUCache(maxsize=TRACKER_MAX_SIZE, ttl=TRACKER_TTL)
+
+# Channel ID -> name cache; names almost never change, so skip the conversations_info
+# round trip on every forwarded message. Bounded so a workspace with many channels
+# (all preloaded at startup) cannot grow it without limit.
+CHANNEL_NAME_TTL = int(os.environ.get("CHANNEL_NAME_TTL", "3600"))
+CHANNEL_NAME_CACHE_SIZE = int(os.environ.get("CHANNEL_NAME_CACHE_SIZE", "10000"))
+channel_name_cache = LRUCache(maxsize=CHANNEL_NAME_CACHE_SIZE, ttl=CHANNEL_NAME_TTL)
+
+def get_channel_name(channel_id):
+    """Return a channel's name, calling conversations_info only on a cache miss or expiry"""
+    channel_name = channel_name_cache.get(channel_id)
+    if channel_name is not None:
+        return channel_name
+
+    channel_name = client.conversations_info(channel=channel_id)["channel"]["name"]
+    channel_name_cache[channel_id] = channel_name
+    return channel_name
+
+def remember_channel_names(names):
+    """Cache {channel_id: name} pairs learned from responses fetched for other reasons"""
+    channel_name_cache.update(names.items())
+
+def seed_channel_names():
+    """Prime channel_name_cache from the channels saved by the last discovery run.
+
+    Lets the handlers filter known channels by name without a conversations_info call.
+    """
+    try:
+        with open('data/discovered_channels.json', 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except (FileNotFoundError, ValueError) as e:
+        logger.warning(f"Could not seed channel names from discovered_channels.json: {e}")
+        return
+
+    names = {
+        channel["id"]: channel["name"]
+        for channel in data.get("channels", [])
+        if channel.get("id") and channel.get("name")
+    }
+    remember_channel_names(names)
+    logger.info(f"📇 Seeded {len(names)} channel names from discovery data")
+
+seed_channel_names()
+
+# The live channel name cache is written here on shutdown and read back on start,
+# so names learned since the last discovery run survive a restart
+CHANNEL_NAMES_SNAPSHOT = f"data/channel_names_{current_bot_config.bot_id}.json"
+
+def save_channel_names_snapshot():
+    """Write the unexpired channel_name_cache entries to CHANNEL_NAMES_SNAPSHOT"""
+    names = dict(channel_name_cache.items())
+    tmp_path = CHANNEL_NAMES_SNAPSHOT + ".tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({"saved_at": time.time(), "channels": names}, f)
+        os.replace(tmp_path, CHANNEL_NAMES_SNAPSHOT)
+    except OSError as e:
+        logger.warning(f"Could not save {CHANNEL_NAMES_SNAPSHOT}: {e}")
+
+def load_channel_names_snapshot():
+    """Restore channel names saved at the last shutdown, if they are younger than CHANNEL_NAME_TTL"""
+    try:
+        with open(CHANNEL_NAMES_SNAPSHOT, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except (FileNotFoundError, ValueError):
+        return
+
+    # Entries keep only the TTL they had left when they were saved
+    remaining = CHANNEL_NAME_TTL - (time.time() - data.get("saved_at", 0))
+    if remaining <= 0:
+        return
+    names = data.get("channels", {})
+    channel_name_cache.update(names.items(), ttl=remaining)
+    logger.info(f"📇 Restored {len(names)} channel names from the last shutdown")
+
+load_channel_names_snapshot()
+atexit.register(save_channel_names_snapshot)
 
-# Store message IDs to track edits and thread relationships
-message_tracker = {}
-thread_tracker = {}
+def _exit_on_sigterm(signum, frame):
+    """Turn SIGTERM (docker stop, process.terminate) into a normal exit so atexit handlers run"""
+    sys.exit(0)
+
+def preload_channel_names():
+    """Cache the name of every channel the bot can see, a page of conversations_list at a time.
+
+    Run once at startup so steady-state events almost never need conversations_info,
+    including events from channels that are about to be filtered out.
+    """
+    try:
+        count = 0
+        for channel in iter_conversations("public_channel,private_channel"):
+            channel_name_cache[channel["id"]] = channel["name"]
+            count += 1
+        logger.info(f"📇 Preloaded {count} channel names")
+    except SlackApiError as e:
+        logger.error(f"Error preloading channel names: {e.response['error']}")
 
 def validate_master_channels():
     """Validate that master channel IDs are set and accessible"""
@@ -222,458 +439,362 @@ def validate_master_channels():
     if not MANAGED_ADMIN_MASTER_CHANNEL_ID or not STORM_ADMIN_MASTER_CHANNEL_ID:
         raise ValueError("MANAGED_ADMIN_MASTER_CHANNEL_ID and STORM_ADMIN_MASTER_CHANNEL_ID must be set in environment variables")
 
-    try:
-        # Validate agent master channel
-        agent_info = client.conversations_info(channel=AGENT_MASTER_CHANNEL_ID)
-        logger.info(f"Agent master channel validated: {agent_info['channel']['name']}")
-
-        # Validate apptbk master channel
-        apptbk_info = client.conversations_info(channel=APPTBK_MASTER_CHANNEL_ID)
-        logger.info(f"Apptbk master channel validated: {apptbk_info['channel']['name']}")
-
-        # Validate managed admin master channel
-        managed_info = client.conversations_info(channel=MANAGED_ADMIN_MASTER_CHANNEL_ID)
-        logger.info(f"Managed admin master channel validated: {managed_info['channel']['name']}")
+    names = check_master_channels(client, [
+        ("Agent", AGENT_MASTER_CHANNEL_ID),
+        ("Apptbk", APPTBK_MASTER_CHANNEL_ID),
+        ("Managed admin", MANAGED_ADMIN_MASTER_CHANNEL_ID),
+        ("Storm admin", STORM_ADMIN_MASTER_CHANNEL_ID),
+    ], get_bot_user_id, slack_io_pool)
+    remember_channel_names(names)
 
-        # Validate storm admin master channel
-        storm_info = client.conversations_info(channel=STORM_ADMIN_MASTER_CHANNEL_ID)
-        logger.info(f"Storm admin master channel validated: {storm_info['channel']['name']}")
-
-    except SlackApiError as e:
-        logger.error(f"Error validating master channels: {e.response['error']}")
-        raise
+EST = ZoneInfo("America/New_York")
+EST_FORMAT = '%Y-%m-%d %I:%M:%S %p %Z'
 
+# Slack ts strings recur (parents, coalesced groups, edits), so formatted times are memoized
+@lru_cache(maxsize=4096)
 def convert_to_est(timestamp):
     """Convert Unix timestamp to EST time string"""
-    utc_time = datetime.fromtimestamp(float(timestamp))
-    est = pytz.timezone('US/Eastern')
-    est_time = utc_time.astimezone(est)
-    return est_time.strftime('%Y-%m-%d %I:%M:%S %p %Z')
+    return datetime.fromtimestamp(float(timestamp), tz=EST).strftime(EST_FORMAT)
+
+def iter_conversations(types, page_size=200):
+    """Yield every conversation of the given types, following conversations_list cursors page by page"""
+    cursor = None
+    while True:
+        response = client.conversations_list(
+            types=types,
+            limit=page_size,
+            cursor=cursor
+        )
+        yield from response["channels"]
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return
 
 def fetch_private_channels():
     """Fetch all private channels and filter those ending with -admin or -agents"""
     try:
-        # Fetch all private channels
-        response = client.conversations_list(
-            types="private_channel",
-            limit=1000
-        )
-        channels = response["channels"]
         filtered_channels = []
-        # Filter channels ending with -admin or -agent
-        for channel in channels:
-            if (channel["name"].endswith("-admin") or
-                channel["name"].endswith("-agents") or
-                channel["name"].endswith("-agent") or
-                channel["name"].endswith("-admins") or
-                channel["name"].endswith("-apptbk")):
+        # Filter channels ending with -admin, -agent or -apptbk
+        for channel in iter_conversations("private_channel"):
+            if channel["name"].endswith(TARGET_SUFFIXES):
                 filtered_channels.append(channel)
-                logger.info(f"Found target channel: {channel['name']} ({channel['id']})")
+                logger.info("Found target channel: %s (%s)", channel["name"], channel["id"])
             else:
-                logger.debug(f"Skipping non-target channel: {channel['name']}")
+                logger.debug("Skipping non-target channel: %s", channel["name"])
         return filtered_channels
     except SlackApiError as e:
-        logger.error(f"Error fetching channels: {e.response['error']}")
+        logger.error("Error fetching channels: %s", e.response["error"])
         return []
-def invite_bot_to_channels(channels):
-    """Invite the bot to the specified channels"""
-    bot_user_id = client.auth_test()["user_id"]
-    for channel in channels:
-        try:
-            # Check if bot is already in the channel
-            members = client.conversations_members(channel=channel["id"])["members"]
-            if bot_user_id not in members:
-                client.conversations_invite(
-                    channel=channel["id"],
-                    users=bot_user_id
-                )
-                logger.info(f"Invited bot to channel: {channel['name']}")
-            else:
-                logger.info(f"Bot already in channel: {channel['name']}")
-        except SlackApiError as e:
-            logger.error(f"Error inviting bot to channel {channel['name']}: {e.response['error']}")
-
-def forward_managed_admin_message(channel_id, text, user, timestamp, message_ts=None, thread_ts=None, is_thread_reply=False, attachments=None, files=None):
-    """Forward messages from managed client admin channels to managed master channel"""
-    try:
-        # Get channel info
-        channel_info = client.conversations_info(channel=channel_id)["channel"]
-        channel_name = channel_info["name"]
-        
-        # Ensure this is a managed admin channel
-        if not (channel_name.endswith("-admin") or channel_name.endswith("-admins")):
-            logger.error(f"forward_managed_admin_message called for non-admin channel: {channel_name}")
-            return
-            
-        if channel_name not in CHANNEL_CATEGORIZATIONS['managed_channels']:
-            logger.error(f"forward_managed_admin_message called for non-managed channel: {channel_name}")
-            return
-            
-        # Check if channel should be ignored
-        if channel_name in IGNORED_CHANNEL_NAMES:
-            logger.info(f"Ignoring message from explicitly ignored channel: {channel_name}")
-            return
-            
-        if channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-            logger.info(f"Ignoring message from ignored managed admin channel: {channel_name}")
-            return
-            
-        if not MANAGED_ADMIN_MASTER_CHANNEL_ID:
-            logger.error(f"MANAGED_ADMIN_MASTER_CHANNEL_ID not set, cannot forward message from {channel_name}")
-            return
-            
-        target_channel = MANAGED_ADMIN_MASTER_CHANNEL_ID
-
-        
-        # Format the forwarded message
-        est_time = convert_to_est(timestamp)
-        message = f"*From #{channel_name}*\n{text}\n_Posted by <@{user}> at {est_time}_"
 
-        # Prepare message parameters
-        message_params = {
-            "channel": target_channel,
-            "text": message
-        }
+_bot_user_id = None
 
-        # Add thread_ts if this is a thread reply
-        if is_thread_reply:
-            parent_key = f"{channel_id}_{thread_ts}"
+def get_bot_user_id():
+    """Return this bot's user ID, calling auth_test only the first time"""
+    global _bot_user_id
+    if _bot_user_id is None:
+        _bot_user_id = client.auth_test()["user_id"]
+    return _bot_user_id
 
-            if parent_key in message_tracker:
-                message_params["thread_ts"] = message_tracker[parent_key]
-            else:
-                # Try to fetch the original message and its thread
-                try:
-                    result = client.conversations_history(
-                        channel=channel_id,
-                        latest=thread_ts,
-                        limit=1,
-                        inclusive=True
-                    )
-
-                    if result["messages"]:
-                        original_msg = result["messages"][0]
-                        original_ts = original_msg["ts"]
-
-                        thread_result = client.conversations_replies(
-                            channel=channel_id,
-                            ts=original_ts
-                        )
-
-                        if thread_result["messages"]:
-                            parent_msg = thread_result["messages"][0]
-                            parent_ts = parent_msg["ts"]
-
-                            if f"{channel_id}_{parent_ts}" not in message_tracker:
-                                parent_message = f"*From #{channel_name}*\n{parent_msg['text']}\n_Posted by <@{parent_msg['user']}> at {convert_to_est(parent_ts)}_"
-                                parent_response = client.chat_postMessage(
-                                    channel=target_channel,
-                                    text=parent_message
-                                )
-                                message_tracker[f"{channel_id}_{parent_ts}"] = parent_response["ts"]
-
-                            message_params["thread_ts"] = message_tracker[f"{channel_id}_{parent_ts}"]
-
-                except SlackApiError as e:
-                    logger.error(f"Error fetching thread messages: {e.response['error']}")
-                    return
+# Concurrent membership checks/invites; stays under Slack's tier-3 limits
+INVITE_WORKERS = 16
 
-        # Handle files if present
-        if files:
-            for file in files:
-                try:
-                    # Get file info
-                    file_info = client.files_info(file=file["id"])
-
-                    # Add file to message
-                    if "attachments" not in message_params:
-                        message_params["attachments"] = []
-
-                    # Create a file attachment
-                    file_attachment = {
-                        "fallback": f"File: {file_info['file']['name']}",
-                        "title": file_info["file"]["name"],
-                        "title_link": file_info["file"]["url_private"],
-                        "text": f"File shared by <@{user}>",
-                        "ts": timestamp
-                    }
-
-                    # Add image_url for image files
-                    if file_info["file"]["mimetype"].startswith("image/"):
-                        file_attachment["image_url"] = file_info["file"]["url_private"]
-
-                    message_params["attachments"].append(file_attachment)
-
-                except SlackApiError as e:
-                    logger.error(f"Error handling file: {e.response['error']}")
-
-        # Add regular attachments if present
-        if attachments:
-            if "attachments" not in message_params:
-                message_params["attachments"] = []
-            message_params["attachments"].extend(attachments)
-
-        if message_ts:
-            # This is an edit, update the existing message
-            message_params["ts"] = message_ts
-            client.chat_update(**message_params)
+def is_channel_member(channel_id, user_id):
+    """Page through a channel's members, stopping as soon as user_id is found"""
+    cursor = None
+    while True:
+        response = client.conversations_members(channel=channel_id, limit=1000, cursor=cursor)
+        if user_id in response["members"]:
+            return True
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return False
+
+def _invite_bot_to_channel(channel, bot_user_id, joined=None):
+    """Invite the bot to one channel unless it is already a member.
+
+    `joined` holds the IDs of the channels the bot is known to be in; without it,
+    membership is checked against the channel's member list.
+    """
+    try:
+        # Check if bot is already in the channel
+        if joined is not None:
+            is_member = channel["id"] in joined
         else:
-            # This is a new message
-            response = client.chat_postMessage(**message_params)
-            # Store the message ID for future edits and thread tracking
-            message_tracker[f"{channel_id}_{timestamp}"] = response["ts"]
+            is_member = is_channel_member(channel["id"], bot_user_id)
+        if not is_member:
+            client.conversations_invite(
+                channel=channel["id"],
+                users=bot_user_id
+            )
+            logger.info("Invited bot to channel: %s", channel["name"])
+        else:
+            logger.info("Bot already in channel: %s", channel["name"])
+    except SlackApiError as e:
+        logger.error("Error inviting bot to channel %s: %s", channel["name"], e.response["error"])
+
+def invite_bot_to_channels(channels):
+    """Invite the bot to the specified channels"""
+    bot_user_id = get_bot_user_id()
+    # The listing that produced these channels already has their names
+    remember_channel_names({channel["id"]: channel["name"] for channel in channels})
 
+    # One users_conversations listing covers every channel, instead of paging each
+    # channel's member list; fall back to the per-channel check if it fails
+    try:
+        joined = get_joined_channels(client, bot_user_id)
     except SlackApiError as e:
-        logger.error(f"Error forwarding managed admin message: {e.response['error']}")
+        logger.warning("Could not list the bot's channels, checking each channel instead: %s", e.response["error"])
+        joined = None
 
-def forward_storm_admin_message(channel_id, text, user, timestamp, message_ts=None, thread_ts=None, is_thread_reply=False, attachments=None, files=None):
-    """Forward messages from storm client admin channels to storm master channel"""
+    with ThreadPoolExecutor(max_workers=INVITE_WORKERS, thread_name_prefix="invite") as pool:
+        for channel in channels:
+            pool.submit(_invite_bot_to_channel, channel, bot_user_id, joined)
+
+@dataclass(frozen=True)
+class Route:
+    """Forwarding rules for one type of source channel"""
+    label: str                          # Used in log lines, e.g. "managed admin"
+    target_channel: Optional[str]       # Master channel ID messages are forwarded to
+    target_env: str                     # Environment variable that sets target_channel
+
+# Which channels belong to which route is decided by channel_route()
+ROUTES = {
+    "managed_admin": Route("managed admin", MANAGED_ADMIN_MASTER_CHANNEL_ID, "MANAGED_ADMIN_MASTER_CHANNEL_ID"),
+    "storm_admin": Route("storm admin", STORM_ADMIN_MASTER_CHANNEL_ID, "STORM_ADMIN_MASTER_CHANNEL_ID"),
+    "agent": Route("agent", AGENT_MASTER_CHANNEL_ID, "AGENT_MASTER_CHANNEL_ID"),
+    "apptbk": Route("apptbk", APPTBK_MASTER_CHANNEL_ID, "APPTBK_MASTER_CHANNEL_ID"),
+}
+
+# Channel name -> "*From #name*\n" header. Keyed by name rather than ID so a
+# renamed channel simply gets a new entry; the set of names is small and stable.
+_header_cache = {}
+
+def format_forwarded_message(channel_name, text, user, est_time):
+    """Build the text posted to a master channel for a source message"""
+    header = _header_cache.get(channel_name)
+    if header is None:
+        header = _header_cache.setdefault(channel_name, f"*From #{sys.intern(channel_name)}*\n")
+    return "".join((header, text, "\n_Posted by <@", user, "> at ", est_time, "_"))
+
+# (channel_id, thread_ts) of parents Slack could not return, so further replies in
+# the same thread post top-level right away instead of asking again each time
+_missing_parents = LRUCache(maxsize=10_000, ttl=300)
+
+# (channel_id, thread_ts) -> Lock, so concurrent replies to the same unseen parent
+# fetch and post it once instead of each posting their own copy
+_parent_locks = {}
+_parent_locks_lock = threading.Lock()
+
+def _resolve_parent_ts(channel_id, thread_ts, target_channel, channel_name):
+    """Return the master-channel ts of a thread's parent, posting the parent first if needed.
+
+    Returns None when the parent cannot be found. Raises SlackApiError on API failures.
+    """
+    key = (channel_id, thread_ts)
+    tracked = message_tracker.get(key)
+    if tracked:
+        return tracked.ts
+    if key in _missing_parents:
+        return None
+
+    with _parent_locks_lock:
+        lock = _parent_locks.setdefault(key, threading.Lock())
+    with lock:
+        try:
+            # Another reply may have posted the parent while we waited
+            tracked = message_tracker.get(key)
+            if tracked:
+                return tracked.ts
+            if key in _missing_parents:
+                return None
+            return _post_parent(channel_id, thread_ts, target_channel, channel_name)
+        finally:
+            with _parent_locks_lock:
+                if _parent_locks.get(key) is lock:
+                    del _parent_locks[key]
+
+def _post_parent(channel_id, thread_ts, target_channel, channel_name):
+    """Fetch a thread's parent from the source channel and post it to the master channel"""
+    # thread_ts is the parent's ts, and replies lists the parent first
     try:
-        # Get channel info
-        channel_info = client.conversations_info(channel=channel_id)["channel"]
-        channel_name = channel_info["name"]
-        
-        # Ensure this is a storm admin channel
-        if not (channel_name.endswith("-admin") or channel_name.endswith("-admins")):
-            logger.error(f"forward_storm_admin_message called for non-admin channel: {channel_name}")
-            return
-            
-        if channel_name not in CHANNEL_CATEGORIZATIONS['storm_channels']:
-            logger.error(f"forward_storm_admin_message called for non-storm channel: {channel_name}")
-            return
-            
-        # Check if channel should be ignored
-        if channel_name in IGNORED_CHANNEL_NAMES:
-            logger.info(f"Ignoring message from explicitly ignored channel: {channel_name}")
-            return
-            
-        if channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-            logger.info(f"Ignoring message from ignored storm admin channel: {channel_name}")
-            return
-            
-        if not STORM_ADMIN_MASTER_CHANNEL_ID:
-            logger.error(f"STORM_ADMIN_MASTER_CHANNEL_ID not set, cannot forward message from {channel_name}")
-            return
-            
-        target_channel = STORM_ADMIN_MASTER_CHANNEL_ID
+        thread_result = client.conversations_replies(
+            channel=channel_id,
+            ts=thread_ts,
+            limit=1
+        )
+    except SlackApiError as e:
+        if e.response["error"] == "thread_not_found":
+            _missing_parents[(channel_id, thread_ts)] = True
+            return None
+        raise
+    if not thread_result["messages"]:
+        _missing_parents[(channel_id, thread_ts)] = True
+        return None
+
+    parent_msg = thread_result["messages"][0]
+    parent_ts = parent_msg["ts"]
+    tracked = message_tracker.get((channel_id, parent_ts))
+    if not tracked:
+        parent_message = format_forwarded_message(channel_name, parent_msg['text'], parent_msg['user'], convert_to_est(parent_ts))
+        parent_response = client.chat_postMessage(
+            channel=target_channel,
+            text=parent_message
+        )
+        tracked = TrackedMsg(ts=parent_response["ts"], target_channel=target_channel)
+        message_tracker[(channel_id, parent_ts)] = tracked
 
+    return tracked.ts
 
-        # Format the forwarded message
-        est_time = convert_to_est(timestamp)
-        message = f"*From #{channel_name}*\n{text}\n_Posted by <@{user}> at {est_time}_"
+# With THREAD_BACKFILL_ASYNC, replies to unseen parents skip the parent lookup on the
+# forward path; the parent is fetched and posted here afterwards
+THREAD_BACKFILL_ASYNC = os.environ.get("THREAD_BACKFILL_ASYNC", "false").lower() == "true"
+orphan_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="orphan")
 
-        # Prepare message parameters
-        message_params = {
-            "channel": target_channel,
-            "text": message
-        }
+def _backfill_orphan(channel_id, thread_ts, target_channel, channel_name, timestamp, orphan_ts, message_params):
+    """Post an orphaned reply's parent, then move the reply into the parent's thread.
 
-        # Add thread_ts if this is a thread reply
-        if is_thread_reply:
-            parent_key = f"{channel_id}_{thread_ts}"
+    Slack cannot re-thread a message, so the reply is reposted under the parent and
+    the top-level copy deleted. If the parent cannot be found the reply stays top-level.
+    """
+    try:
+        parent_master_ts = _resolve_parent_ts(channel_id, thread_ts, target_channel, channel_name)
+        if not parent_master_ts:
+            return
+        response = client.chat_postMessage(**message_params, thread_ts=parent_master_ts)
+        message_tracker[(channel_id, timestamp)] = TrackedMsg(ts=response["ts"], target_channel=target_channel)
+        client.chat_delete(channel=target_channel, ts=orphan_ts)
+    except SlackApiError as e:
+        logger.error("Error backfilling thread parent for %s: %s", channel_name, e.response["error"])
+    except Exception as e:
+        logger.error("Error backfilling thread parent for %s: %s", channel_name, e)
 
-            if parent_key in message_tracker:
-                message_params["thread_ts"] = message_tracker[parent_key]
-            else:
-                # Try to fetch the original message and its thread
-                try:
-                    result = client.conversations_history(
-                        channel=channel_id,
-                        latest=thread_ts,
-                        limit=1,
-                        inclusive=True
-                    )
-
-                    if result["messages"]:
-                        original_msg = result["messages"][0]
-                        original_ts = original_msg["ts"]
-
-                        thread_result = client.conversations_replies(
-                            channel=channel_id,
-                            ts=original_ts
-                        )
-
-                        if thread_result["messages"]:
-                            parent_msg = thread_result["messages"][0]
-                            parent_ts = parent_msg["ts"]
-
-                            if f"{channel_id}_{parent_ts}" not in message_tracker:
-                                parent_message = f"*From #{channel_name}*\n{parent_msg['text']}\n_Posted by <@{parent_msg['user']}> at {convert_to_est(parent_ts)}_"
-                                parent_response = client.chat_postMessage(
-                                    channel=target_channel,
-                                    text=parent_message
-                                )
-                                message_tracker[f"{channel_id}_{parent_ts}"] = parent_response["ts"]
-
-                            message_params["thread_ts"] = message_tracker[f"{channel_id}_{parent_ts}"]
-
-                except SlackApiError as e:
-                    logger.error(f"Error fetching thread messages: {e.response['error']}")
-                    return
+# File fields needed to build an attachment
+FILE_FIELDS = frozenset(("name", "url_private", "mimetype"))
 
-        # Handle files if present
-        if files:
-            for file in files:
-                try:
-                    # Get file info
-                    file_info = client.files_info(file=file["id"])
-
-                    # Add file to message
-                    if "attachments" not in message_params:
-                        message_params["attachments"] = []
-
-                    # Create a file attachment
-                    file_attachment = {
-                        "fallback": f"File: {file_info['file']['name']}",
-                        "title": file_info["file"]["name"],
-                        "title_link": file_info["file"]["url_private"],
-                        "text": f"File shared by <@{user}>",
-                        "ts": timestamp
-                    }
-
-                    # Add image_url for image files
-                    if file_info["file"]["mimetype"].startswith("image/"):
-                        file_attachment["image_url"] = file_info["file"]["url_private"]
-
-                    message_params["attachments"].append(file_attachment)
-
-                except SlackApiError as e:
-                    logger.error(f"Error handling file: {e.response['error']}")
-
-        # Add regular attachments if present
-        if attachments:
-            if "attachments" not in message_params:
-                message_params["attachments"] = []
-            message_params["attachments"].extend(attachments)
+# files_info results for payloads that lacked the fields above (e.g. edits and
+# some bot posts); repeat lookups of the same file are served from here
+file_info_cache = LRUCache(maxsize=10_000, ttl=3600)
 
-        if message_ts:
-            # This is an edit, update the existing message
-            message_params["ts"] = message_ts
-            client.chat_update(**message_params)
-        else:
-            # This is a new message
-            response = client.chat_postMessage(**message_params)
-            # Store the message ID for future edits and thread tracking
-            message_tracker[f"{channel_id}_{timestamp}"] = response["ts"]
+def get_file_info(file_id):
+    """Return the files_info "file" object, calling Slack only on a cache miss"""
+    file_info = file_info_cache.get(file_id)
+    if file_info is None:
+        file_info = client.files_info(file=file_id)["file"]
+        file_info_cache[file_id] = file_info
+    return file_info
 
+def _fetch_file_info(file_id):
+    """Return (file object, None) or (None, SlackApiError) for one file"""
+    try:
+        return get_file_info(file_id), None
     except SlackApiError as e:
-        logger.error(f"Error forwarding storm admin message: {e.response['error']}")
-
-def forward_agent_message(channel_id, text, user, timestamp, message_ts=None, thread_ts=None, is_thread_reply=False, attachments=None, files=None):
-    """Forward messages from agent channels to agent master channel"""
+        return None, e
+
+def _fetch_file_infos(file_ids):
+    """Return {file_id: (file object, error)}, calling files_info concurrently for cache misses.
+
+    Cached files and a lone miss are resolved on the calling thread, since a pool
+    hop only pays off when several requests can overlap.
+    """
+    results = {}
+    misses = []
+    for file_id in dict.fromkeys(file_ids):
+        file_info = file_info_cache.get(file_id)
+        if file_info is None:
+            misses.append(file_id)
+        else:
+            results[file_id] = (file_info, None)
+    if len(misses) == 1:
+        results[misses[0]] = _fetch_file_info(misses[0])
+    elif misses:
+        results.update(zip(misses, slack_io_pool.map(_fetch_file_info, misses)))
+    return results
+
+def _forward(route, evt):
+    """Forward a message from a source channel to the master channel of `route`"""
+    channel_id, channel_name, text, user, timestamp, message_ts, thread_ts, is_thread_reply, attachments, files = evt
     try:
-        # Get channel info
-        channel_info = client.conversations_info(channel=channel_id)["channel"]
-        channel_name = channel_info["name"]
-        
-        # Ensure this is an agent channel
-        if not (channel_name.endswith("-agent") or channel_name.endswith("-agents")):
-            logger.error(f"forward_agent_message called for non-agent channel: {channel_name}")
-            return
-            
-        # Check if channel should be ignored
-        if channel_name in IGNORED_CHANNEL_NAMES:
-            logger.info(f"Ignoring message from explicitly ignored channel: {channel_name}")
-            return
-            
-        if channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-            logger.info(f"Ignoring message from ignored agent channel: {channel_name}")
+        # Ensure the channel belongs to this route. channel_route() applies the suffix,
+        # category and ignore-list rules (and logs ignored/unknown channels) once per name.
+        route_key = channel_route(channel_name)
+        if ROUTES.get(route_key) is not route:
+            if route_key is not None:
+                logger.error("%s forwarding called for %s channel: %s", route.label, ROUTES[route_key].label, channel_name)
             return
-            
-        if not AGENT_MASTER_CHANNEL_ID:
-            logger.error(f"AGENT_MASTER_CHANNEL_ID not set, cannot forward message from {channel_name}")
+
+        target_channel = route.target_channel
+        if not target_channel:
+            logger.error("%s not set, cannot forward message from %s", route.target_env, channel_name)
             return
-            
-        target_channel = AGENT_MASTER_CHANNEL_ID
 
-        
-        # Format the forwarded message
-        est_time = convert_to_est(timestamp)
-        message = f"*From #{channel_name}*\n{text}\n_Posted by <@{user}> at {est_time}_"
+        # Message events already carry name/url_private/mimetype on each file; only
+        # fall back to files_info (run concurrently) for files missing them
+        missing_ids = [file["id"] for file in files if not FILE_FIELDS.issubset(file)] if files else []
+
+        # A reply whose parent was never forwarded is posted top-level right away
+        # and moved under the parent once _backfill_orphan has posted it
+        orphan = (is_thread_reply and THREAD_BACKFILL_ASYNC
+                  and message_tracker.get((channel_id, thread_ts)) is None)
+
+        # Add thread_ts if this is a thread reply. When files_info lookups are also
+        # needed, resolve the parent alongside them instead of before them.
+        parent_master_ts = None
+        if is_thread_reply and not orphan:
+            parent_args = (channel_id, thread_ts, target_channel, channel_name)
+            parent_future = slack_io_pool.submit(_resolve_parent_ts, *parent_args) if missing_ids else None
+            fetched = _fetch_file_infos(missing_ids)
+            try:
+                parent_master_ts = parent_future.result() if parent_future else _resolve_parent_ts(*parent_args)
+            except SlackApiError as e:
+                logger.error("Error fetching thread messages: %s", e.response["error"])
+                return
+        else:
+            fetched = _fetch_file_infos(missing_ids)
 
-        # Prepare message parameters
+        # Format the forwarded message only now that nothing above has given up on it
         message_params = {
             "channel": target_channel,
-            "text": message
+            "text": format_forwarded_message(channel_name, text, user, convert_to_est(timestamp))
         }
-
-        # Add thread_ts if this is a thread reply
-        if is_thread_reply:
-            parent_key = f"{channel_id}_{thread_ts}"
-
-            if parent_key in message_tracker:
-                message_params["thread_ts"] = message_tracker[parent_key]
-            else:
-                # Try to fetch the original message and its thread
-                try:
-                    result = client.conversations_history(
-                        channel=channel_id,
-                        latest=thread_ts,
-                        limit=1,
-                        inclusive=True
-                    )
-
-                    if result["messages"]:
-                        original_msg = result["messages"][0]
-                        original_ts = original_msg["ts"]
-
-                        thread_result = client.conversations_replies(
-                            channel=channel_id,
-                            ts=original_ts
-                        )
-
-                        if thread_result["messages"]:
-                            parent_msg = thread_result["messages"][0]
-                            parent_ts = parent_msg["ts"]
-
-                            if f"{channel_id}_{parent_ts}" not in message_tracker:
-                                parent_message = f"*From #{channel_name}*\n{parent_msg['text']}\n_Posted by <@{parent_msg['user']}> at {convert_to_est(parent_ts)}_"
-                                parent_response = client.chat_postMessage(
-                                    channel=target_channel,
-                                    text=parent_message
-                                )
-                                message_tracker[f"{channel_id}_{parent_ts}"] = parent_response["ts"]
-
-                            message_params["thread_ts"] = message_tracker[f"{channel_id}_{parent_ts}"]
-
-                except SlackApiError as e:
-                    logger.error(f"Error fetching thread messages: {e.response['error']}")
-                    return
-
-        # Handle files if present
+        if parent_master_ts:
+            message_params["thread_ts"] = parent_master_ts
+
+        # File cards first, then the source message's own attachments. With
+        # REHOST_FILES a new post's files are uploaded after it instead of carded;
+        # chat_update cannot attach uploads, so an edit keeps the cards.
+        rehost = REHOST_FILES and not message_ts
+        message_attachments = []
+        shared_files = []
         if files:
             for file in files:
-                try:
-                    # Get file info
-                    file_info = client.files_info(file=file["id"])
-
-                    # Add file to message
-                    if "attachments" not in message_params:
-                        message_params["attachments"] = []
-
-                    # Create a file attachment
-                    file_attachment = {
-                        "fallback": f"File: {file_info['file']['name']}",
-                        "title": file_info["file"]["name"],
-                        "title_link": file_info["file"]["url_private"],
-                        "text": f"File shared by <@{user}>",
-                        "ts": timestamp
-                    }
-
-                    # Add image_url for image files
-                    if file_info["file"]["mimetype"].startswith("image/"):
-                        file_attachment["image_url"] = file_info["file"]["url_private"]
-
-                    message_params["attachments"].append(file_attachment)
-
-                except SlackApiError as e:
-                    logger.error(f"Error handling file: {e.response['error']}")
-
-        # Add regular attachments if present
-        if attachments:
-            if "attachments" not in message_params:
-                message_params["attachments"] = []
-            message_params["attachments"].extend(attachments)
+                if (result := fetched.get(file["id"])) is not None:
+                    file, error = result
+                    if error:
+                        logger.error("Error handling file: %s", error.response["error"])
+                        continue
+                if rehost:
+                    shared_files.append(file)
+                    continue
+                name, url, mimetype = file["name"], file["url_private"], file["mimetype"]
+
+                # Create a file attachment
+                file_attachment = {
+                    "fallback": f"File: {name}",
+                    "title": name,
+                    "title_link": url,
+                    "text": f"File shared by <@{user}>",
+                    "ts": timestamp
+                }
+
+                # Add image_url for image files
+                if mimetype.startswith("image/"):
+                    file_attachment["image_url"] = url
+
+                message_attachments.append(file_attachment)
+
+        message_attachments.extend(attachments)
+        if message_attachments:
+            message_params["attachments"] = message_attachments
 
         if message_ts:
             # This is an edit, update the existing message
@@ -683,179 +804,261 @@ def forward_agent_message(channel_id, text, user, timestamp, message_ts=None, th
             # This is a new message
             response = client.chat_postMessage(**message_params)
             # Store the message ID for future edits and thread tracking
-            message_tracker[f"{channel_id}_{timestamp}"] = response["ts"]
+            message_tracker[(channel_id, timestamp)] = TrackedMsg(ts=response["ts"], target_channel=target_channel)
+            if orphan:
+                orphan_pool.submit(_backfill_orphan, channel_id, thread_ts, target_channel, channel_name,
+                                   timestamp, response["ts"], message_params)
+            if shared_files:
+                rehost_files(client, shared_files, target_channel, message_params.get("thread_ts"), slack_io_pool)
 
     except SlackApiError as e:
-        logger.error(f"Error forwarding agent message: {e.response['error']}")
+        logger.error("Error forwarding %s message: %s", route.label, e.response["error"])
 
-def forward_apptbk_message(channel_id, text, user, timestamp, message_ts=None, thread_ts=None, is_thread_reply=False, attachments=None, files=None):
-    """Forward ALL messages (bots and non-bots) from apptbk channels to master-apptbk"""
-    try:
-        # Get channel info
-        channel_info = client.conversations_info(channel=channel_id)["channel"]
-        channel_name = channel_info["name"]
-        
-            # Ensure this is an apptbk channel
-        if not channel_name.endswith("-apptbk"):
-            logger.error(f"forward_apptbk_message called for non-apptbk channel: {channel_name}")
-            return
-            
-        # Check if channel should be ignored
-        if channel_name in IGNORED_CHANNEL_NAMES:
-            logger.info(f"Ignoring message from explicitly ignored channel: {channel_name}")
-            return
-            
-        if channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-            logger.info(f"Ignoring message from ignored apptbk channel: {channel_name}")
-            return
-            
-        target_channel = APPTBK_MASTER_CHANNEL_ID
-
-
-        # Format the forwarded message
-        est_time = convert_to_est(timestamp)
-        message = f"*From #{channel_name}*\n{text}\n_Posted by <@{user}> at {est_time}_"
+def forward_managed_admin_message(evt):
+    """Forward messages from managed client admin channels to managed master channel"""
+    _forward(ROUTES["managed_admin"], evt)
 
-        # Prepare message parameters
-        message_params = {
-            "channel": target_channel,
-            "text": message
-        }
+def forward_storm_admin_message(evt):
+    """Forward messages from storm client admin channels to storm master channel"""
+    _forward(ROUTES["storm_admin"], evt)
 
-        # Add thread_ts if this is a thread reply
-        if is_thread_reply:
-            parent_key = f"{channel_id}_{thread_ts}"
+def forward_agent_message(evt):
+    """Forward messages from agent channels to agent master channel"""
+    _forward(ROUTES["agent"], evt)
 
-            if parent_key in message_tracker:
-                message_params["thread_ts"] = message_tracker[parent_key]
-            else:
-                # Try to fetch the original message and its thread
-                try:
-                    result = client.conversations_history(
-                        channel=channel_id,
-                        latest=thread_ts,
-                        limit=1,
-                        inclusive=True
-                    )
-
-                    if result["messages"]:
-                        original_msg = result["messages"][0]
-                        original_ts = original_msg["ts"]
-
-                        thread_result = client.conversations_replies(
-                            channel=channel_id,
-                            ts=original_ts
-                        )
-
-                        if thread_result["messages"]:
-                            parent_msg = thread_result["messages"][0]
-                            parent_ts = parent_msg["ts"]
-
-                            if f"{channel_id}_{parent_ts}" not in message_tracker:
-                                parent_message = f"*From #{channel_name}*\n{parent_msg['text']}\n_Posted by <@{parent_msg['user']}> at {convert_to_est(parent_ts)}_"
-                                parent_response = client.chat_postMessage(
-                                    channel=target_channel,
-                                    text=parent_message
-                                )
-                                message_tracker[f"{channel_id}_{parent_ts}"] = parent_response["ts"]
-
-                            message_params["thread_ts"] = message_tracker[f"{channel_id}_{parent_ts}"]
-
-                except SlackApiError as e:
-                    logger.error(f"Error fetching thread messages: {e.response['error']}")
-                    return
+def forward_apptbk_message(evt):
+    """Forward ALL messages (bots and non-bots) from apptbk channels to master-apptbk"""
+    _forward(ROUTES["apptbk"], evt)
+
+def _route_admin(channel_name, categorizations):
+    """Resolve an admin channel to the managed or storm route"""
+    if channel_name in categorizations['managed_channels']:
+        return "managed_admin"
+    if channel_name in categorizations['storm_channels']:
+        return "storm_admin"
+    # Unknown admin channel - don't forward
+    logger.warning("Unknown admin channel %s - not forwarding", channel_name)
+    return None
+
+# Channel kind (from the name suffix) -> resolver returning a ROUTES key or None
+KIND_ROUTERS = {
+    "admin": _route_admin,
+    "agent": lambda channel_name, categorizations: "agent",
+    "apptbk": lambda channel_name, categorizations: "apptbk",
+}
+
+# Channel name -> ROUTES key (or None) for the CHANNEL_CATEGORIZATIONS dict it was
+# computed from; replaced wholesale whenever the categorizations are reloaded
+_route_cache = {}
+_route_cache_source = None
+
+def channel_route(channel_name):
+    """Return the ROUTES key for a channel, or None if its messages are not forwarded.
+
+    Folds the ignore lists, suffix and managed/storm checks into one memoized lookup
+    per channel name.
+    """
+    global _route_cache, _route_cache_source
+    categorizations = CHANNEL_CATEGORIZATIONS
+    if categorizations is not _route_cache_source:
+        _route_cache, _route_cache_source = {}, categorizations
+    cache = _route_cache
 
-        # Handle files if present
-        if files:
-            for file in files:
-                try:
-                    # Get file info
-                    file_info = client.files_info(file=file["id"])
-
-                    # Add file to message
-                    if "attachments" not in message_params:
-                        message_params["attachments"] = []
-
-                    # Create a file attachment
-                    file_attachment = {
-                        "fallback": f"File: {file_info['file']['name']}",
-                        "title": file_info["file"]["name"],
-                        "title_link": file_info["file"]["url_private"],
-                        "text": f"File shared by <@{user}>",
-                        "ts": timestamp
-                    }
-
-                    # Add image_url for image files
-                    if file_info["file"]["mimetype"].startswith("image/"):
-                        file_attachment["image_url"] = file_info["file"]["url_private"]
-
-                    message_params["attachments"].append(file_attachment)
-
-                except SlackApiError as e:
-                    logger.error(f"Error handling file: {e.response['error']}")
-
-        # Add regular attachments if present
-        if attachments:
-            if "attachments" not in message_params:
-                message_params["attachments"] = []
-            message_params["attachments"].extend(attachments)
+    try:
+        return cache[channel_name]
+    except KeyError:
+        pass
+
+    route_key = None
+    if channel_name in IGNORED_CHANNEL_NAMES or channel_name in categorizations['ignored_channels']:
+        logger.info("Ignoring messages from ignored channel: %s", channel_name)
+    else:
+        router = KIND_ROUTERS.get(channel_kind(channel_name))
+        if router is not None:
+            route_key = router(channel_name, categorizations)
+
+    cache[channel_name] = route_key
+    return route_key
+
+def forward_message(evt):
+    """Route messages to the forwarding route matching the source channel"""
+    route_key = channel_route(evt.channel_name)
+    if route_key is None:
+        return
 
-        if message_ts:
-            # This is an edit, update the existing message
-            message_params["ts"] = message_ts
-            client.chat_update(**message_params)
-        else:
-            # This is a new message
-            response = client.chat_postMessage(**message_params)
-            # Store the message ID for future edits and thread tracking
-            message_tracker[f"{channel_id}_{timestamp}"] = response["ts"]
+    _forward(ROUTES[route_key], evt)
 
-    except SlackApiError as e:
-        logger.error(f"Error forwarding apptbk message: {e.response['error']}")
+# Forwarding runs off the Bolt dispatch threads so a slow chain of Slack calls
+# (parent recovery, file lookups, post) never holds up the next event.
+# Bolt acks each event before its listener runs, so the pending bound only caps
+# memory; hitting it stalls the Bolt worker, never the ack.
+FORWARD_WORKERS = int(os.environ.get("FORWARD_WORKERS", "16"))
+MAX_PENDING_FORWARDS = int(os.environ.get("MAX_PENDING_FORWARDS", "10000"))
+forward_pool = ThreadPoolExecutor(max_workers=FORWARD_WORKERS, thread_name_prefix="forward")
+forward_slots = threading.BoundedSemaphore(MAX_PENDING_FORWARDS)
 
-def forward_message(channel_id, text, user, timestamp, message_ts=None, thread_ts=None, is_thread_reply=False, attachments=None, files=None):
-    """Route messages to appropriate dedicated forwarding functions based on source channel"""
+def _run_forward(evt):
+    """Run forward_message on a pool thread, logging anything it raises"""
     try:
-        # Get channel info to determine the type
-        channel_info = client.conversations_info(channel=channel_id)["channel"]
-        channel_name = channel_info["name"]
-
-        # Check if channel should be ignored first
-        if channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-            logger.info(f"Ignoring message from ignored channel: {channel_name}")
+        forward_message(evt)
+    except Exception as e:
+        logger.error("[%s] Error forwarding message: %s", current_bot_config.name, e)
+    finally:
+        forward_slots.release()
+
+# channel_id -> deque of pending MessageEvents. A channel has an entry only while a
+# drain task for it is queued or running, so each channel's messages are forwarded
+# one at a time and in arrival order while different channels proceed in parallel.
+_channel_backlogs = {}
+_channel_backlogs_lock = threading.Lock()
+
+# When enabled, consecutive plain messages from one user that pile up in a channel's
+# backlog are forwarded as a single post instead of one post each. With a window,
+# the drain also waits that many milliseconds of quiet for the rest of a burst.
+COALESCE_BURSTS = os.environ.get("COALESCE_BURSTS", "false").lower() == "true"
+COALESCE_MAX_MESSAGES = int(os.environ.get("COALESCE_MAX_MESSAGES", "20"))
+COALESCE_WINDOW = int(os.environ.get("COALESCE_WINDOW_MS", "0")) / 1000
+
+# (channel_id, ts) -> shared [[ts, text], ...] list for every message in a coalesced
+# post, so an edit to one line can rebuild the whole post rather than replace it
+coalesced_groups = LRUCache(maxsize=TRACKER_MAX_SIZE, ttl=TRACKER_TTL)
+
+def _can_coalesce(evt):
+    """True for new top-level messages without files or attachments"""
+    return not (evt.message_ts or evt.is_thread_reply or evt.files or evt.attachments)
+
+def _take_burst(backlog, first, rest):
+    """Move queued messages that continue first's burst from backlog to rest.
+
+    Caller holds _channel_backlogs_lock. Returns True if the burst can still grow.
+    """
+    while backlog and len(rest) + 1 < COALESCE_MAX_MESSAGES:
+        if not (_can_coalesce(backlog[0]) and backlog[0].user == first.user):
+            return False
+        rest.append(backlog.popleft())
+    return len(rest) + 1 < COALESCE_MAX_MESSAGES
+
+def _run_coalesced(channel_id, first, rest):
+    """Forward `first` and the `rest` of a same-user burst as one post"""
+    group = [[first.timestamp, first.text]] + [[evt.timestamp, evt.text] for evt in rest]
+    _run_forward(first._replace(text="\n".join(text for _, text in group)))
+    for _ in rest:
+        forward_slots.release()
+
+    # Every source message maps to the combined post for later edits and replies
+    tracked = message_tracker.get((channel_id, first.timestamp))
+    if tracked:
+        for ts, _ in group:
+            message_tracker[(channel_id, ts)] = tracked
+            coalesced_groups[(channel_id, ts)] = group
+
+def _expand_coalesced_edit(channel_id, evt):
+    """Rewrite an edit to one line of a coalesced post into an edit of the whole post"""
+    group = coalesced_groups.get((channel_id, evt.timestamp))
+    if not group:
+        return evt
+    for line in group:
+        if line[0] == evt.timestamp:
+            line[1] = evt.text
+    return evt._replace(text="\n".join(text for _, text in group), timestamp=group[0][0])
+
+def _drain_channel(channel_id):
+    """Forward a channel's pending messages in order until its backlog is empty"""
+    while True:
+        rest = []
+        with _channel_backlogs_lock:
+            backlog = _channel_backlogs[channel_id]
+            if not backlog:
+                del _channel_backlogs[channel_id]
+                return
+            evt = backlog.popleft()
+            growing = COALESCE_BURSTS and _can_coalesce(evt) and _take_burst(backlog, evt, rest)
+
+        # Keep collecting while the burst is still arriving; stop after a quiet window.
+        # The backlog stays registered meanwhile, so new messages queue up behind us.
+        while growing and COALESCE_WINDOW:
+            time.sleep(COALESCE_WINDOW)
+            with _channel_backlogs_lock:
+                taken = len(rest)
+                growing = _take_burst(backlog, evt, rest) and len(rest) > taken
+
+        if rest:
+            _run_coalesced(channel_id, evt, rest)
+        elif COALESCE_BURSTS and evt.message_ts:
+            _run_forward(_expand_coalesced_edit(channel_id, evt))
+        else:
+            _run_forward(evt)
+
+def shutdown_forwarding():
+    """Stop taking new forwards and wait until everything already queued is posted"""
+    forward_pool.shutdown(wait=True)
+
+def submit_forward(evt):
+    """Queue forward_message(evt) behind any pending forwards from the same channel.
+
+    Blocks once MAX_PENDING_FORWARDS are queued or running, so a burst applies
+    backpressure to the event handlers instead of growing the backlog without bound.
+    """
+    forward_slots.acquire()
+    channel_id = evt.channel_id
+    with _channel_backlogs_lock:
+        backlog = _channel_backlogs.get(channel_id)
+        if backlog is not None:
+            backlog.append(evt)
             return
-
-        # Route to dedicated functions based on channel type
-        if channel_name.endswith("-apptbk"):
-            forward_apptbk_message(channel_id, text, user, timestamp, message_ts, thread_ts, is_thread_reply, attachments, files)
-        elif channel_name.endswith("-admin") or channel_name.endswith("-admins"):
-            # Check if it's a managed or storm client
-            if channel_name in CHANNEL_CATEGORIZATIONS['managed_channels']:
-                forward_managed_admin_message(channel_id, text, user, timestamp, message_ts, thread_ts, is_thread_reply, attachments, files)
-            elif channel_name in CHANNEL_CATEGORIZATIONS['storm_channels']:
-                forward_storm_admin_message(channel_id, text, user, timestamp, message_ts, thread_ts, is_thread_reply, attachments, files)
-            else:
-                # Unknown admin channel - don't forward
-                logger.warning(f"Unknown admin channel {channel_name} - not forwarding")
-        elif channel_name.endswith("-agent") or channel_name.endswith("-agents"):
-            forward_agent_message(channel_id, text, user, timestamp, message_ts, thread_ts, is_thread_reply, attachments, files)
-
-    except SlackApiError as e:
-        logger.error(f"Error in forward_message router: {e.response['error']}")
-        return
+        _channel_backlogs[channel_id] = deque([evt])
+    try:
+        forward_pool.submit(_drain_channel, channel_id)
+    except Exception:
+        # Pool is shutting down; give back the slots of everything left for this channel
+        with _channel_backlogs_lock:
+            dropped = _channel_backlogs.pop(channel_id, ())
+        for _ in dropped:
+            forward_slots.release()
+        raise
 
 @app.event("message")
 def handle_message(event, say):
     """Handle incoming messages"""
+    # Edits arrive as message events with subtype message_changed, and Bolt only runs
+    # the first listener that matches, so they are routed to the edit handler here
+    if event.get("subtype") == "message_changed":
+        handle_message_edit(event, say)
+        return
     try:
         channel_id = event["channel"]
 
+        # Cheap set lookups first: the bots' own posts in master channels, and
+        # subtypes with nothing to forward, never reach the locks or the network
+        if channel_id in MASTER_CHANNEL_IDS or event.get("subtype") in SKIPPED_SUBTYPES:
+            return
+
+        # Drop redeliveries of an event this process has already seen
+        event_ts = event.get("event_ts") or event.get("ts")
+        if event_ts and not seen_events.add((channel_id, event_ts)):
+            return
+
+        # Filter on the (almost always cached) channel name before claiming, so events
+        # from channels that are never forwarded cost no Redis round trip
+        try:
+            channel_name = get_channel_name(channel_id)
+
+            # Only process messages from forwarded channels (not ignored, known category)
+            route_key = channel_route(channel_name)
+            if route_key is None:
+                return
+
+            # Ignore bot messages in non-apptbk channels
+            if "bot_id" in event and route_key != "apptbk":
+                return
+
+        except SlackApiError as e:
+            logger.error("Channel error [%s]: %s", channel_id, e.response['error'])
+            return
+
         # FIRST-COME-FIRST-SERVE: Message ID-based deduplication
-        msg_id = event.get("client_msg_id")
-        if not msg_id:
-            # Fallback: Create deterministic hash from event content
-            event_signature = f"{channel_id}:{event.get('user', 'bot')}:{event.get('text', '')[:50]}"
-            msg_id = hashlib.md5(event_signature.encode()).hexdigest()[:16]
+        # Fallback: Create deterministic hash from event content
+        msg_id = event.get("client_msg_id") or fallback_message_id(channel_id, event)
         
         message_key = f"processed:{msg_id}:{channel_id}"
         
@@ -866,53 +1069,16 @@ def handle_message(event, say):
                 if not redis_client.set(message_key, current_bot_config.bot_id, ex=300, nx=True):
                     return  # Duplicate - already processed by another bot
             except Exception as redis_error:
-                logger.error(f"Redis error: {redis_error}")
+                logger.error("Redis error: %s", redis_error)
                 # Fallback to in-memory cache
-                with cache_lock:
-                    if message_key in processed_messages_cache:
-                        return
-                    processed_messages_cache[message_key] = time.time()
-        else:
-            # Use in-memory cache as fallback
-            with cache_lock:
-                current_time = time.time()
-                
-                # Clean old entries (older than 5 minutes)
-                expired_keys = [k for k, v in processed_messages_cache.items() if current_time - v > 300]
-                for k in expired_keys:
-                    del processed_messages_cache[k]
-                
-                # Check if already processed
-                if message_key in processed_messages_cache:
+                if not claim_locally(message_key):
                     return
-                
-                # Mark as processed IMMEDIATELY (claim ownership)
-                processed_messages_cache[message_key] = current_time
-
-        try:
-            channel_info = client.conversations_info(channel=channel_id)["channel"]
-            channel_name = channel_info["name"]
-
-            # Ignore messages from ignored channels
-            if channel_name in IGNORED_CHANNEL_NAMES or channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-                return
-
-            # Ignore bot messages in non-apptbk channels
-            if "bot_id" in event and not channel_name.endswith("-apptbk"):
-                return
-
-            # Only process messages from target channels
-            if not (channel_name.endswith("-admin") or
-                   channel_name.endswith("-admins") or
-                   channel_name.endswith("-agent") or
-                   channel_name.endswith("-agents") or
-                   channel_name.endswith("-apptbk")):
+        else:
+            # Use in-memory cache as fallback; claiming is atomic, so the first
+            # handler to get here owns the message
+            if not claim_locally(message_key):
                 return
 
-        except SlackApiError as e:
-            logger.error(f"Channel error [{channel_id}]: {e.response['error']}")
-            return
-
         text = event.get("text", "")
         user = event.get("user") or event.get("bot_id", "unknown")
         timestamp = event["ts"]
@@ -921,10 +1087,11 @@ def handle_message(event, say):
         files = event.get("files", [])
         is_thread_reply = thread_ts is not None and thread_ts != timestamp
 
-        logger.info(f"[{current_bot_config.name}] {channel_name}")
+        logger.info("[%s] %s", current_bot_config.name, channel_name)
 
-        forward_message(
+        submit_forward(MessageEvent(
             channel_id=channel_id,
+            channel_name=channel_name,
             text=text,
             user=user,
             timestamp=timestamp,
@@ -932,25 +1099,53 @@ def handle_message(event, say):
             is_thread_reply=is_thread_reply,
             attachments=attachments,
             files=files
-        )
+        ))
     except Exception as e:
-        logger.error(f"[{current_bot_config.name}] Error handling message: {str(e)}")
+        logger.error("[%s] Error handling message: %s", current_bot_config.name, e)
 
-@app.event("message_changed")
 def handle_message_edit(event, say):
-    """Handle edited messages"""
+    """Handle edited messages (message events with subtype message_changed, via handle_message)"""
     try:
         # Get the edited message details
         edited_message = event["message"]
         channel_id = event["channel"]
         timestamp = edited_message["ts"]
-        
+
+        # Ignore messages from master channels
+        if channel_id in MASTER_CHANNEL_IDS:
+            return
+
+        # Drop redeliveries of an event this process has already seen
+        event_ts = event.get("event_ts") or event.get("ts")
+        if event_ts and not seen_events.add((channel_id, event_ts)):
+            return
+
+        # Only edits to messages this bot can see a forwarded copy of can be applied.
+        # Checking first skips the claim and channel lookup for every other edit,
+        # and leaves the claim to a bot that can actually update the post.
+        tracked = message_tracker.get((channel_id, timestamp))
+        if not tracked:
+            return
+
+        try:
+            channel_name = get_channel_name(channel_id)
+
+            # Only process edits from forwarded channels (not ignored, known category)
+            route_key = channel_route(channel_name)
+            if route_key is None:
+                return
+
+            # Ignore bot edits in non-apptbk channels
+            if "bot_id" in edited_message and route_key != "apptbk":
+                return
+
+        except SlackApiError as e:
+            logger.error("Channel error [%s]: %s", channel_id, e.response['error'])
+            return
+
         # FIRST-COME-FIRST-SERVE: Message ID-based deduplication for edits
-        msg_id = edited_message.get("client_msg_id")
-        if not msg_id:
-            # Fallback: Create deterministic hash from event content
-            event_signature = f"{channel_id}:{edited_message.get('user', 'bot')}:{edited_message.get('text', '')[:50]}"
-            msg_id = hashlib.md5(event_signature.encode()).hexdigest()[:16]
+        # Fallback: Create deterministic hash from event content
+        msg_id = edited_message.get("client_msg_id") or fallback_message_id(channel_id, edited_message)
         
         message_key = f"processed:{msg_id}:{channel_id}:edit"
         
@@ -961,66 +1156,37 @@ def handle_message_edit(event, say):
                 if not redis_client.set(message_key, current_bot_config.bot_id, ex=300, nx=True):
                     return  # Duplicate edit
             except Exception as redis_error:
-                logger.error(f"Redis error: {redis_error}")
+                logger.error("Redis error: %s", redis_error)
                 # Fallback to in-memory cache
-                with cache_lock:
-                    if message_key in processed_messages_cache:
-                        return
-                    processed_messages_cache[message_key] = time.time()
-        else:
-            # Use in-memory cache as fallback
-            with cache_lock:
-                current_time = time.time()
-                
-                # Check if already processed
-                if message_key in processed_messages_cache:
+                if not claim_locally(message_key):
                     return
-                
-                # Mark as processed IMMEDIATELY (claim ownership)
-                processed_messages_cache[message_key] = current_time
-
-        try:
-            channel_info = client.conversations_info(channel=channel_id)["channel"]
-            channel_name = channel_info["name"]
-
-            # Ignore edits from ignored channels
-            if channel_name in IGNORED_CHANNEL_NAMES or channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
-                return
-
-            # Ignore bot edits in non-apptbk channels
-            if "bot_id" in edited_message and not channel_name.endswith("-apptbk"):
-                return
-
-            # Ignore messages from master channels
-            if channel_id in [AGENT_MASTER_CHANNEL_ID, APPTBK_MASTER_CHANNEL_ID, 
-                            MANAGED_ADMIN_MASTER_CHANNEL_ID, STORM_ADMIN_MASTER_CHANNEL_ID]:
-                return
-
-            # Only process edits from target channels
-            if not (channel_name.endswith("-admin") or
-                   channel_name.endswith("-admins") or
-                   channel_name.endswith("-agent") or
-                   channel_name.endswith("-agents") or
-                   channel_name.endswith("-apptbk")):
+        else:
+            # Use in-memory cache as fallback; claiming is atomic, so the first
+            # handler to get here owns the message
+            if not claim_locally(message_key):
                 return
 
-        except SlackApiError as e:
-            logger.error(f"Channel error [{channel_id}]: {e.response['error']}")
-            return
-
-        # Get the original message ID
-        message_key = f"{channel_id}_{timestamp}"
-        if message_key in message_tracker:
-            # Forward the edited message
-            forward_message(
-                channel_id=channel_id,
-                text=edited_message["text"],
-                user=edited_message.get("user") or edited_message.get("bot_id", "unknown"),
-                timestamp=timestamp,
-                message_ts=message_tracker[message_key]
-            )
+        # Forward the edited message
+        submit_forward(MessageEvent(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            text=edited_message["text"],
+            user=edited_message.get("user") or edited_message.get("bot_id", "unknown"),
+            timestamp=timestamp,
+            message_ts=tracked.ts,
+            attachments=edited_message.get("attachments", []),
+            files=edited_message.get("files", [])
+        ))
     except Exception as e:
-        logger.error(f"Error handling message edit: {str(e)}")
+        logger.error("Error handling message edit: %s", e)
+
+@app.event("channel_rename")
+def handle_channel_rename(event):
+    """Keep the channel name cache in step with renames"""
+    channel = event.get("channel", {})
+    if channel.get("id") and channel.get("name"):
+        channel_name_cache[channel["id"]] = channel["name"]
+        logger.info("Channel renamed: %s -> %s", channel['id'], channel['name'])
 
 def main():
     """Main function to initialize the bot"""
@@ -1039,11 +1205,17 @@ def main():
         # Validate master channels
         validate_master_channels()
 
+        # Warm the channel name cache without delaying the connection
+        threading.Thread(target=preload_channel_names, daemon=True).start()
+
         # Start the channel mapping scheduler in a background thread
         scheduler_thread = threading.Thread(target=client_list_scheduler, daemon=True)
         scheduler_thread.start()
         logger.info("🚀 Channel mapping scheduler thread started")
 
+        if TRACKER_DB:
+            threading.Thread(target=tracker_sweeper, daemon=True).start()
+
         # Note: Channel invitation removed - not needed for mapping functionality
         logger.info("🚀 Bot initialization complete - ready to listen for messages")
         # Start the app with current bot's app token (from environment variable set by multi_bot_launcher)
@@ -1053,7 +1225,13 @@ def main():
         
         # Check if we're running in the main thread (for signal handling)
         if threading.current_thread() is threading.main_thread():
-            handler.start()
+            signal.signal(signal.SIGTERM, _exit_on_sigterm)
+            try:
+                handler.start()
+            finally:
+                # Ctrl+C or SIGTERM: finish the forwards that were already acked
+                scheduler_stop.set()
+                shutdown_forwarding()
         else:
             # If running in a thread, use connect() instead of start()
             handler.connect()
@@ -1063,7 +1241,9 @@ def main():
                     time.sleep(1)
             except KeyboardInterrupt:
                 logger.info("🛑 Bot thread interrupted")
+                scheduler_stop.set()
                 handler.disconnect()
+                shutdown_forwarding()
                 
     except Exception as e:
         logger.error(f"Error in main: {str(e)}")
@@ -19,14 +19,20 @@ load_dotenv()
 import os
 import sys
 import json
-import hashlib
+import queue
+import signal
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from hashlib import blake2b
 import logging
 import time
 import threading
 import importlib.util
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from slack_sdk import WebClient
+from redis.exceptions import NoScriptError
 from slack_sdk.errors import SlackApiError
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
@@ -35,14 +41,21 @@ from slack_bolt.adapter.socket_mode import SocketModeHandler
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 from config.multi_bot_config import MultiBotConfigManager
-from config.channel_discovery import ChannelDiscoveryManager
+from utils.cache import LRUCache
+from utils.client_list_schedule import run_client_list_scheduler
+from utils.config_jobs import run_config_job
+from utils.master_channels import validate_master_channels as check_master_channels
+from utils.slack_client import create_web_client
 
 
 # ----------------------------------------------------------------------------
 # Logging
 # ----------------------------------------------------------------------------
-logging.basicConfig(level=logging.INFO)
+# LOG_LEVEL=WARNING in production skips the per-message INFO lines entirely
+logging.basicConfig(level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO))
 logger = logging.getLogger(__name__)
+# The SDK logs every request and response body at DEBUG; keep only its warnings
+logging.getLogger("slack_sdk").setLevel(logging.WARNING)
 
 
 # ----------------------------------------------------------------------------
@@ -90,8 +103,9 @@ multi_bot_manager = MultiBotConfigManager()
 current_bot_config = multi_bot_manager.get_current_bot_config()
 
 # Use env-provided tokens when set (multi-bot launcher sets these per thread)
-client = WebClient(token=os.environ.get("SLACK_BOT_TOKEN", current_bot_config.bot_token))
-app = App(token=os.environ.get("SLACK_BOT_TOKEN", current_bot_config.bot_token))
+client = create_web_client(os.environ.get("SLACK_BOT_TOKEN", current_bot_config.bot_token))
+# Bolt shares the same client (and its SSL context) instead of building its own
+app = App(client=client)
 
 
 # ----------------------------------------------------------------------------
@@ -102,27 +116,42 @@ APPTBK_MASTER_CHANNEL_ID = os.environ.get("APPTBK_MASTER_CHANNEL_ID")
 MANAGED_ADMIN_MASTER_CHANNEL_ID = os.environ.get("MANAGED_ADMIN_MASTER_CHANNEL_ID")
 STORM_ADMIN_MASTER_CHANNEL_ID = os.environ.get("STORM_ADMIN_MASTER_CHANNEL_ID")
 
+# Every configured master channel; unset IDs are left out
+MASTER_CHANNEL_IDS = frozenset(
+    channel_id for channel_id in (
+        AGENT_MASTER_CHANNEL_ID, APPTBK_MASTER_CHANNEL_ID,
+        MANAGED_ADMIN_MASTER_CHANNEL_ID, STORM_ADMIN_MASTER_CHANNEL_ID,
+    ) if channel_id
+)
+
+# Message subtypes that carry nothing to forward: deletions, and the bookkeeping
+# copy Slack sends when a message gets a thread reply. Edits (message_changed)
+# are handed to handle_message_edit instead.
+SKIPPED_SUBTYPES = frozenset(("message_deleted", "message_replied"))
+
 
 def load_channel_categorizations():
+    """Load channel categorizations as frozensets, safe to share with handler threads unlocked."""
     try:
-        with open('data/channel_lists.json', 'r') as f:
-            data = json.load(f)
+        with open('data/channel_lists.json', 'rb') as f:
+            raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
             return {
-                'managed_channels': set(data.get('managed_channels', [])),
-                'storm_channels': set(data.get('storm_channels', [])),
-                'ignored_channels': set(data.get('ignored_channels', []))
+                'managed_channels': frozenset(data.get('managed_channels', [])),
+                'storm_channels': frozenset(data.get('storm_channels', [])),
+                'ignored_channels': frozenset(data.get('ignored_channels', []))
             }
     except FileNotFoundError:
         logger.warning("channel_lists.json not found, using default categorizations")
         return {
-            'managed_channels': set(),
-            'storm_channels': set(),
-            'ignored_channels': set(["ccdocs-admin", "test-admins"])
+            'managed_channels': frozenset(),
+            'storm_channels': frozenset(),
+            'ignored_channels': frozenset(["ccdocs-admin", "test-admins"])
         }
 
 
 CHANNEL_CATEGORIZATIONS = load_channel_categorizations()
-IGNORED_CHANNEL_NAMES = [
+IGNORED_CHANNEL_NAMES = frozenset([
     "ccdocs-agents",
     "ccdocs-admin",
     "ccdocs-apptbk",
@@ -130,11 +159,11 @@ IGNORED_CHANNEL_NAMES = [
     "building-universal-agents",
     "master-agent",
     "master-admin-storm",
-]
+])
 
 
 # ----------------------------------------------------------------------------
-# Master channel validation (copied from listener.py)
+# Master channel validation (shared with listener.py via utils.master_channels)
 # ----------------------------------------------------------------------------
 def validate_master_channels():
     if not AGENT_MASTER_CHANNEL_ID or not APPTBK_MASTER_CHANNEL_ID:
@@ -143,25 +172,17 @@ def validate_master_channels():
     if not MANAGED_ADMIN_MASTER_CHANNEL_ID or not STORM_ADMIN_MASTER_CHANNEL_ID:
         raise ValueError("MANAGED_ADMIN_MASTER_CHANNEL_ID and STORM_ADMIN_MASTER_CHANNEL_ID must be set in environment variables")
 
-    try:
-        agent_info = client.conversations_info(channel=AGENT_MASTER_CHANNEL_ID)
-        logger.info(f"Agent master channel validated: {agent_info['channel']['name']}")
-
-        apptbk_info = client.conversations_info(channel=APPTBK_MASTER_CHANNEL_ID)
-        logger.info(f"Apptbk master channel validated: {apptbk_info['channel']['name']}")
-
-        managed_info = client.conversations_info(channel=MANAGED_ADMIN_MASTER_CHANNEL_ID)
-        logger.info(f"Managed admin master channel validated: {managed_info['channel']['name']}")
-
-        storm_info = client.conversations_info(channel=STORM_ADMIN_MASTER_CHANNEL_ID)
-        logger.info(f"Storm admin master channel validated: {storm_info['channel']['name']}")
-    except SlackApiError as e:
-        logger.error(f"Error validating master channels: {e.response['error']}")
-        raise
+    names = check_master_channels(client, [
+        ("Agent", AGENT_MASTER_CHANNEL_ID),
+        ("Apptbk", APPTBK_MASTER_CHANNEL_ID),
+        ("Managed admin", MANAGED_ADMIN_MASTER_CHANNEL_ID),
+        ("Storm admin", STORM_ADMIN_MASTER_CHANNEL_ID),
+    ])
+    remember_channel_names(names)
 
 
 # ----------------------------------------------------------------------------
-# Background scheduler (unchanged; Bot-1 refreshes mappings/assignments)
+# Background scheduler (Bot-1 refreshes mappings/assignments; see utils.client_list_schedule)
 # ----------------------------------------------------------------------------
 def update_client_lists():
     try:
@@ -170,9 +191,7 @@ def update_client_lists():
         if current_bot_config.bot_id == 1:
             logger.info("🔍 Running channel discovery and assignment (Bot 1 responsibility)...")
             try:
-                discovery_manager = ChannelDiscoveryManager(multi_bot_manager)
-                assignments = discovery_manager.run_full_discovery()
-                if assignments:
+                if run_config_job("config.channel_discovery"):
                     logger.info("✅ Channel discovery and assignment completed")
                 else:
                     logger.warning("⚠️ Channel discovery failed")
@@ -184,10 +203,7 @@ def update_client_lists():
         if current_bot_config.bot_id == 1:
             logger.info("🗺️ Running channel mapping (Bot 1 responsibility)...")
             try:
-                from config.channel_mapper import ChannelMapper
-                mapper = ChannelMapper()
-                success = mapper.run_full_mapping()
-                if success:
+                if run_config_job("config.channel_mapper"):
                     logger.info("✅ Channel mapping completed successfully")
                 else:
                     logger.warning("⚠️ Channel mapping failed")
@@ -201,6 +217,7 @@ def update_client_lists():
         global CHANNEL_CATEGORIZATIONS
         CHANNEL_CATEGORIZATIONS = load_channel_categorizations()
         multi_bot_manager._load_channel_assignments()
+        seed_channel_names()
 
         assigned_channels = multi_bot_manager.get_current_bot_channels()
         logger.info(f"📊 Updated counts for {current_bot_config.name}:")
@@ -212,17 +229,13 @@ def update_client_lists():
         logger.error(f"❌ Exception during channel mapping update: {str(e)}")
 
 
+# Set to stop the scheduler thread promptly instead of waiting out its sleep
+scheduler_stop = threading.Event()
+
+
 def client_list_scheduler():
-    logger.info("🕐 Channel mapping scheduler started - will update every 12 hours")
-    update_client_lists()
-    while True:
-        try:
-            time.sleep(43200)  # 12h
-            update_client_lists()
-        except Exception as e:
-            logger.error(f"❌ Error in client list scheduler: {str(e)}")
-            logger.info("⏰ Retrying in 1 hour due to error...")
-            time.sleep(3600)
+    """Update client lists and channel mappings at fixed UTC times until scheduler_stop is set"""
+    run_client_list_scheduler(update_client_lists, scheduler_stop, leader=current_bot_config.bot_id == 1)
 
 
 # ----------------------------------------------------------------------------
@@ -231,24 +244,36 @@ def client_list_scheduler():
 STREAM_JOBS = "forwarding:jobs"
 FCFS_TTL_SEC = 300  # 5 minutes for cross-bot FCFS claim
 
+# (channel_id, event_ts) of events this process has already handled. Slack redelivers
+# events it thinks went unacknowledged; those are dropped here before the Redis claim.
+seen_events = LRUCache(maxsize=100_000, ttl=FCFS_TTL_SEC)
 
-def build_fcfs_key(event_type: str, channel_id: str, identifier: str) -> str:
-    if event_type == "message_changed":
-        return f"fcfs:edit:{channel_id}:{identifier}"
-    return f"fcfs:msg:{channel_id}:{identifier}"
+
+def is_redelivery(event: Dict[str, Any]) -> bool:
+    """Record the event and return True if this process has already seen it."""
+    event_ts = event.get("event_ts") or event.get("ts")
+    return bool(event_ts) and not seen_events.add((event.get("channel"), event_ts))
 
 
-def try_fcfs_claim(key: str, value: str) -> bool:
-    """First-come-first-serve claim across all bots, TTL 5 minutes.
+def fallback_message_id(channel_id: str, message: Dict[str, Any]) -> str:
+    """Deterministic 16-hex-digit id for a message without client_msg_id.
 
-    Stores the message identifier as the value for traceability/debugging.
+    Built from the channel, author and first 50 characters; every bot must derive
+    the same id for the FCFS claim to work.
     """
-    try:
-        return bool(r.set(key, value, nx=True, ex=FCFS_TTL_SEC))
-    except Exception as e:
-        logger.error(f"Redis SET NX failed for {key}: {e}")
-        # If Redis is unavailable, we cannot guarantee dedup; best effort: allow one bot to proceed
-        return True
+    event_signature = f"{channel_id}:{message.get('user', 'bot')}:{message.get('text', '')[:50]}"
+    return blake2b(event_signature.encode(), digest_size=8).hexdigest()
+
+
+# Claim keys carry the stream's name as their hash tag, so under Redis Cluster each
+# claim lands in the stream's slot and CLAIM_AND_ENQUEUE can touch both keys
+FCFS_HASH_TAG = "{" + STREAM_JOBS + "}"
+
+
+def build_fcfs_key(event_type: str, channel_id: str, identifier: str) -> str:
+    if event_type == "message_changed":
+        return f"fcfs:edit:{FCFS_HASH_TAG}:{channel_id}:{identifier}"
+    return f"fcfs:msg:{FCFS_HASH_TAG}:{channel_id}:{identifier}"
 
 
 def get_message_identifier_from_event(event: Dict[str, Any]) -> str:
@@ -260,55 +285,253 @@ def get_message_identifier_from_event(event: Dict[str, Any]) -> str:
     return event.get("client_msg_id") or event.get("ts", "")
 
 
-def enqueue_forward_job(payload: Dict[str, Any]) -> Optional[str]:
-    """Push a normalized job to Redis Streams for the worker."""
+# File fields copied into jobs; the worker needs nothing else to forward a file
+JOB_FILE_FIELDS = ("id", "name", "url_private", "mimetype")
+
+
+STREAM_MAXLEN = 10000  # Approximate stream cap to avoid unbounded growth
+
+# First-come-first-serve claim across all bots and, only if this bot won it, the
+# XADD of its job, in one round trip. Both keys share a slot (see FCFS_HASH_TAG). ARGV: claim value, claim TTL, stream cap,
+# then the job's field/value pairs. Returns the stream entry id, or false if
+# another bot holds the claim.
+CLAIM_AND_ENQUEUE = r.register_script("""
+if not redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return false
+end
+return redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', unpack(ARGV, 4))
+""")
+
+
+def flatten_job(payload: Dict[str, Any]) -> List[Any]:
+    """Return a job as alternating field/value stream arguments, dropping None values.
+
+    Nested fields are serialized as JSON strings, since Streams only accept flat fields.
+    """
+    fields: List[Any] = []
+    for k, v in payload.items():
+        if isinstance(v, (dict, list)):
+            fields += (k, orjson.dumps(v) if orjson else json.dumps(v))
+        elif v is not None:
+            fields += (k, str(v))
+    return fields
+
+
+# Handlers queue their jobs and job_flusher claims and enqueues them in batches:
+# up to ENQUEUE_BATCH_SIZE script calls per pipelined round trip, waiting at most
+# ENQUEUE_BATCH_WINDOW_MS after the first job of a batch for more to arrive
+ENQUEUE_BATCH_SIZE = int(os.environ.get("ENQUEUE_BATCH_SIZE", "50"))
+ENQUEUE_BATCH_WINDOW = int(os.environ.get("ENQUEUE_BATCH_WINDOW_MS", "5")) / 1000
+MAX_PENDING_JOBS = int(os.environ.get("MAX_PENDING_JOBS", "10000"))
+
+# (claim key, claim value, job payload, flattened job) waiting for job_flusher
+pending_jobs: "queue.Queue[Tuple[str, str, Dict[str, Any], List[Any]]]" = queue.Queue(maxsize=MAX_PENDING_JOBS)
+
+# Set at shutdown; job_flusher finishes the batch in hand and exits, so the final
+# drain in flush_pending_jobs sees every job that has not been flushed
+flusher_stop = threading.Event()
+
+
+def queue_job(key: str, value: str, payload: Dict[str, Any]) -> None:
+    """Queue a job to be claimed under key (TTL 5 minutes) and pushed to Redis Streams.
+
+    The claim stores the message identifier as its value for traceability/debugging.
+    Blocks while MAX_PENDING_JOBS are waiting, so a stalled Redis slows the handlers
+    down instead of growing the queue without bound.
+    """
+    pending_jobs.put((key, value, payload, flatten_job(payload)))
+
+
+def _run_claims(batch: List[Tuple[str, str, Dict[str, Any], List[Any]]]) -> List[Any]:
+    """EVALSHA CLAIM_AND_ENQUEUE for each job in one pipelined round trip; errors are returned in place.
+
+    The script is called by sha directly: handing the Script object to the pipeline
+    would add a SCRIPT EXISTS round trip to every flush.
+    """
+    pipe = r.pipeline(transaction=False)
+    for key, value, _, fields in batch:
+        pipe.evalsha(CLAIM_AND_ENQUEUE.sha, 2, key, STREAM_JOBS, value, FCFS_TTL_SEC, STREAM_MAXLEN, *fields)
+    return pipe.execute(raise_on_error=False)
+
+
+def flush_jobs(batch: List[Tuple[str, str, Dict[str, Any], List[Any]]]) -> None:
+    """Claim and enqueue a batch of queued jobs, logging each outcome.
+
+    If Redis is unavailable, dedup cannot be guaranteed and the jobs are lost; each
+    failure is logged.
+    """
     try:
-        # Serialize nested fields as JSON strings (Streams only accept flat fields)
-        flat_payload: Dict[str, str] = {}
-        for k, v in payload.items():
-            if isinstance(v, (dict, list)):
-                flat_payload[k] = json.dumps(v)
-            elif v is None:
-                continue
-            else:
-                flat_payload[k] = str(v)
-
-        # Stream cap to avoid unbounded growth
-        msg_id = r.xadd(STREAM_JOBS, flat_payload, maxlen=10000, approximate=True)
-        return msg_id
+        results = _run_claims(batch)
+        # A Redis restarted since the script was registered has to be sent it again;
+        # the jobs that hit NOSCRIPT never ran, so only they are retried
+        retry = [i for i, result in enumerate(results) if isinstance(result, NoScriptError)]
+        if retry:
+            r.script_load(CLAIM_AND_ENQUEUE.script)
+            for i, result in zip(retry, _run_claims([batch[i] for i in retry])):
+                results[i] = result
     except Exception as e:
-        logger.error(f"Redis XADD failed: {e}")
-        return None
+        results = [e] * len(batch)
+
+    for (key, _, payload, _), result in zip(batch, results):
+        kind = "edit" if payload["type"] == "update" else "message"
+        if isinstance(result, Exception):
+            logger.error("Failed to enqueue %s from #%s: %s", kind, payload["source_channel_name"], result)
+        elif result is not None:
+            logger.info("ENQUEUED %s -> stream=%s id=%s cat=%s src=#%s",
+                        kind, STREAM_JOBS, result, payload["category"], payload["source_channel_name"])
+        # None: another bot already claimed this message (duplicate)
+
+
+def job_flusher() -> None:
+    """Drain pending_jobs until flusher_stop is set, one batch per round trip"""
+    while not flusher_stop.is_set():
+        try:
+            batch = [pending_jobs.get(timeout=1)]
+        except queue.Empty:
+            continue
+        deadline = time.monotonic() + ENQUEUE_BATCH_WINDOW
+        while len(batch) < ENQUEUE_BATCH_SIZE:
+            try:
+                batch.append(pending_jobs.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        try:
+            flush_jobs(batch)
+        except Exception as e:
+            logger.error("Error flushing %d queued jobs: %s", len(batch), e)
+
+
+job_flusher_thread = threading.Thread(target=job_flusher, daemon=True, name="job-flusher")
+
+
+def flush_pending_jobs() -> None:
+    """Flush every job still queued; run at shutdown so acknowledged events are not dropped.
+
+    The flusher is stopped and joined first, so a batch it has already taken off
+    the queue is flushed rather than lost when the process exits.
+    """
+    flusher_stop.set()
+    if job_flusher_thread.is_alive():
+        job_flusher_thread.join()
+    batch = []
+    while True:
+        try:
+            batch.append(pending_jobs.get_nowait())
+        except queue.Empty:
+            break
+    for start in range(0, len(batch), ENQUEUE_BATCH_SIZE):
+        flush_jobs(batch[start:start + ENQUEUE_BATCH_SIZE])
+
+
+def _exit_on_sigterm(signum, frame):
+    """Turn SIGTERM (docker stop, process.terminate) into a normal exit so cleanup runs"""
+    sys.exit(0)
+
+
+# ----------------------------------------------------------------------------
+# Channel names
+# ----------------------------------------------------------------------------
+# Channel ID -> name, so handlers skip the conversations_info round trip on every
+# event. Names are also shared across bots in Redis (one key per channel, same TTL),
+# so a name one bot had to look up is a Redis hit for the others.
+CHANNEL_NAME_TTL = int(os.environ.get("CHANNEL_NAME_TTL", "3600"))
+CHANNEL_NAME_CACHE_SIZE = int(os.environ.get("CHANNEL_NAME_CACHE_SIZE", "10000"))
+CHANNEL_NAME_KEY_PREFIX = "channels:name:"
+channel_name_cache = LRUCache(maxsize=CHANNEL_NAME_CACHE_SIZE, ttl=CHANNEL_NAME_TTL)
+
+
+def remember_channel_names(names: Dict[str, str]) -> None:
+    """Cache {channel_id: name} pairs in this process and in Redis for the other bots"""
+    channel_name_cache.update(names.items())
+    try:
+        pipe = r.pipeline(transaction=False)
+        for channel_id, channel_name in names.items():
+            pipe.set(CHANNEL_NAME_KEY_PREFIX + channel_id, channel_name, ex=CHANNEL_NAME_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Redis SET failed for channel names: %s", e)
+
+
+def get_channel_name(channel_id: str) -> str:
+    """Return a channel's name from memory, then Redis, calling conversations_info only if both miss"""
+    channel_name = channel_name_cache.get(channel_id)
+    if channel_name is not None:
+        return channel_name
+
+    try:
+        channel_name = r.get(CHANNEL_NAME_KEY_PREFIX + channel_id)
+    except Exception as e:
+        logger.warning("Redis GET failed for channel name %s: %s", channel_id, e)
+    if channel_name is not None:
+        channel_name_cache[channel_id] = channel_name
+        return channel_name
+
+    channel_name = client.conversations_info(channel=channel_id)["channel"]["name"]
+    remember_channel_names({channel_id: channel_name})
+    return channel_name
+
+
+def seed_channel_names() -> None:
+    """Prime channel_name_cache from the channels saved by the last discovery run.
+
+    Every bot reads the same file, so the names are only cached in this process.
+    """
+    try:
+        with open('data/discovered_channels.json', 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except (FileNotFoundError, ValueError) as e:
+        logger.warning("Could not seed channel names from discovered_channels.json: %s", e)
+        return
+
+    names = {
+        channel["id"]: channel["name"]
+        for channel in data.get("channels", [])
+        if channel.get("id") and channel.get("name")
+    }
+    channel_name_cache.update(names.items())
+    logger.info("📇 Seeded %d channel names from discovery data", len(names))
+
+
+seed_channel_names()
 
 
 # ----------------------------------------------------------------------------
 # Routing helpers (decide category and target channel)
 # ----------------------------------------------------------------------------
+# Last dash-separated part of a channel name -> category; admin channels are then
+# split into managed/storm by the categorization lists
+CATEGORY_BY_SUFFIX = {
+    "apptbk": "apptbk",
+    "admin": "admin",
+    "admins": "admin",
+    "agent": "agent",
+    "agents": "agent",
+}
+
+TARGET_CHANNEL_BY_CATEGORY = {
+    "managed_admin": MANAGED_ADMIN_MASTER_CHANNEL_ID,
+    "storm_admin": STORM_ADMIN_MASTER_CHANNEL_ID,
+    "agent": AGENT_MASTER_CHANNEL_ID,
+    "apptbk": APPTBK_MASTER_CHANNEL_ID,
+}
+
+
 def classify_channel(channel_name: str) -> Optional[str]:
-    if channel_name.endswith("-apptbk"):
-        return "apptbk"
-    if channel_name.endswith("-admin") or channel_name.endswith("-admins"):
+    _, dash, suffix = channel_name.rpartition("-")
+    category = CATEGORY_BY_SUFFIX.get(suffix) if dash else None
+    if category == "admin":
         if channel_name in CHANNEL_CATEGORIZATIONS['managed_channels']:
             return "managed_admin"
         if channel_name in CHANNEL_CATEGORIZATIONS['storm_channels']:
             return "storm_admin"
         # Unknown admin channel: skip (optional: default to storm)
         return None
-    if channel_name.endswith("-agent") or channel_name.endswith("-agents"):
-        return "agent"
-    return None
+    return category
 
 
 def resolve_target_channel(category: str) -> Optional[str]:
-    if category == "managed_admin":
-        return MANAGED_ADMIN_MASTER_CHANNEL_ID
-    if category == "storm_admin":
-        return STORM_ADMIN_MASTER_CHANNEL_ID
-    if category == "agent":
-        return AGENT_MASTER_CHANNEL_ID
-    if category == "apptbk":
-        return APPTBK_MASTER_CHANNEL_ID
-    return None
+    return TARGET_CHANNEL_BY_CATEGORY.get(category)
 
 
 # ----------------------------------------------------------------------------
@@ -316,44 +539,51 @@ def resolve_target_channel(category: str) -> Optional[str]:
 # ----------------------------------------------------------------------------
 @app.event("message")
 def handle_message(event, body, say):
+    # Edits arrive as message events with subtype message_changed, and Bolt only runs
+    # the first listener that matches, so they are routed to the edit handler here
+    if event.get("subtype") == "message_changed":
+        handle_message_edit(event, body, say)
+        return
     try:
         channel_id = event["channel"]
 
+        # Cheap set lookups before the redelivery cache, the channel name and the Redis claim
+        if channel_id in MASTER_CHANNEL_IDS or event.get("subtype") in SKIPPED_SUBTYPES:
+            return
+
+        if is_redelivery(event):
+            return
+
         # FCFS cross-bot claim using Redis to avoid duplicate processing
         # Priority: client_msg_id (unique) > fallback to content hash (never use timestamp)
-        message_identifier = event.get("client_msg_id")
-        if not message_identifier:
-            # Fallback: Create deterministic hash from event content
-            event_signature = f"{channel_id}:{event.get('user', 'bot')}:{event.get('text', '')[:50]}"
-            message_identifier = hashlib.md5(event_signature.encode()).hexdigest()[:16]
+        # Fallback: Create deterministic hash from event content
+        message_identifier = event.get("client_msg_id") or fallback_message_id(channel_id, event)
         
+        # Claimed together with the enqueue below, once the event is known to be forwarded
         message_key = build_fcfs_key("message", channel_id, message_identifier)
-        if not try_fcfs_claim(message_key, message_identifier):
-            return  # Duplicate - already claimed by another bot
 
         try:
-            channel_info = client.conversations_info(channel=channel_id)["channel"]
-            channel_name = channel_info["name"]
+            channel_name = get_channel_name(channel_id)
 
             # Skip ignored channels
             if channel_name in IGNORED_CHANNEL_NAMES or channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
                 return
 
-            # For apptbk: forward all (including bots). Else: ignore bot messages.
-            if "bot_id" in event and not channel_name.endswith("-apptbk"):
-                return
-
             category = classify_channel(channel_name)
             if not category:
                 return  # Non-target or unknown admin channel
 
+            # For apptbk: forward all (including bots). Else: ignore bot messages.
+            if "bot_id" in event and category != "apptbk":
+                return
+
             target_channel = resolve_target_channel(category)
             if not target_channel:
-                logger.error(f"Target channel not set for category {category}")
+                logger.error("Target channel not set for category %s", category)
                 return
 
         except SlackApiError as e:
-            logger.error(f"Channel error [{channel_id}]: {e.response['error']}")
+            logger.error("Channel error [%s]: %s", channel_id, e.response['error'])
             return
 
         text = event.get("text", "")
@@ -361,7 +591,12 @@ def handle_message(event, body, say):
         timestamp = event["ts"]
         thread_ts = event.get("thread_ts")
         attachments = event.get("attachments", [])
-        files = event.get("files", [])
+        # The worker builds file cards from these fields alone; the rest of each file
+        # object (thumbnails, permalinks, previews) would only bloat the stream entry
+        files = [
+            {field: file[field] for field in JOB_FILE_FIELDS if field in file}
+            for file in event.get("files", [])
+        ]
 
         is_thread_reply = thread_ts is not None and thread_ts != timestamp
 
@@ -381,55 +616,63 @@ def handle_message(event, body, say):
             "bot_id": current_bot_config.bot_id,
         }
 
-        msg_id = enqueue_forward_job(job_payload)
-        if msg_id:
-            logger.info(f"ENQUEUED message -> stream={STREAM_JOBS} id={msg_id} cat={category} src=#{channel_name}")
-        else:
-            logger.error(f"Failed to enqueue message from #{channel_name}")
+        # job_flusher drops it if another bot already claimed this message
+        queue_job(message_key, message_identifier, job_payload)
     except Exception as e:
-        logger.error(f"Error handling message: {str(e)}")
+        logger.error("Error handling message: %s", e)
+
+
+@app.event("channel_rename")
+def handle_channel_rename(event):
+    """Keep the channel name caches in step with renames"""
+    channel = event.get("channel", {})
+    if channel.get("id") and channel.get("name"):
+        remember_channel_names({channel["id"]: channel["name"]})
+        logger.info("Channel renamed: %s -> %s", channel['id'], channel['name'])
 
 
-@app.event("message_changed")
 def handle_message_edit(event, body, say):
+    """Handle edited messages (message events with subtype message_changed, via handle_message)"""
     try:
         edited_message = event["message"]
         channel_id = event["channel"]
         timestamp = edited_message["ts"]
 
+        # Edits in the master channels are the forwarded copies themselves
+        if channel_id in MASTER_CHANNEL_IDS:
+            return
+
+        if is_redelivery(event):
+            return
+
         # FCFS claim for edits
         # Priority: client_msg_id (unique) > fallback to content hash (never use timestamp)
-        edit_identifier = edited_message.get("client_msg_id")
-        if not edit_identifier:
-            # Fallback: Create deterministic hash from event content
-            event_signature = f"{channel_id}:{edited_message.get('user', 'bot')}:{edited_message.get('text', '')[:50]}"
-            edit_identifier = hashlib.md5(event_signature.encode()).hexdigest()[:16]
+        # Fallback: Create deterministic hash from event content
+        edit_identifier = edited_message.get("client_msg_id") or fallback_message_id(channel_id, edited_message)
         
+        # Claimed together with the enqueue below, once the edit is known to be forwarded
         edit_key = build_fcfs_key("message_changed", channel_id, edit_identifier)
-        if not try_fcfs_claim(edit_key, edit_identifier):
-            return  # Duplicate edit - already claimed
 
         try:
-            channel_info = client.conversations_info(channel=channel_id)["channel"]
-            channel_name = channel_info["name"]
+            channel_name = get_channel_name(channel_id)
 
             # Skip ignored channels
             if channel_name in IGNORED_CHANNEL_NAMES or channel_name in CHANNEL_CATEGORIZATIONS['ignored_channels']:
                 return
 
-            if "bot_id" in edited_message and not channel_name.endswith("-apptbk"):
-                return
-
             category = classify_channel(channel_name)
             if not category:
                 return  # Non-target or unknown admin channel
 
+            if "bot_id" in edited_message and category != "apptbk":
+                return
+
             target_channel = resolve_target_channel(category)
             if not target_channel:
-                logger.error(f"Target channel not set for category {category}")
+                logger.error("Target channel not set for category %s", category)
                 return
         except SlackApiError as e:
-            logger.error(f"Channel error [{channel_id}]: {e.response['error']}")
+            logger.error("Channel error [%s]: %s", channel_id, e.response['error'])
             return
 
         user = edited_message.get("user") or edited_message.get("bot_id", "unknown")
@@ -447,13 +690,10 @@ def handle_message_edit(event, body, say):
             "bot_id": current_bot_config.bot_id,
         }
 
-        msg_id = enqueue_forward_job(job_payload)
-        if msg_id:
-            logger.info(f"ENQUEUED edit -> stream={STREAM_JOBS} id={msg_id} cat={category} src=#{channel_name}")
-        else:
-            logger.error(f"Failed to enqueue edit from #{channel_name}")
+        # job_flusher drops it if another bot already claimed this edit
+        queue_job(edit_key, edit_identifier, job_payload)
     except Exception as e:
-        logger.error(f"Error handling message edit: {str(e)}")
+        logger.error("Error handling message edit: %s", e)
 
 
 # ----------------------------------------------------------------------------
@@ -471,11 +711,13 @@ def main():
         logger.info(f"Storm channels: {len(CHANNEL_CATEGORIZATIONS['storm_channels'])}")
         logger.info(f"Ignored channels: {len(CHANNEL_CATEGORIZATIONS['ignored_channels'])}")
 
-        # Start channel mapping scheduler (unchanged)
+        # Start channel mapping scheduler
         scheduler_thread = threading.Thread(target=client_list_scheduler, daemon=True)
         scheduler_thread.start()
         logger.info("🚀 Channel mapping scheduler thread started")
 
+        job_flusher_thread.start()
+
         # Validate master channels before starting
         validate_master_channels()
 
@@ -485,7 +727,13 @@ def main():
         handler = SocketModeHandler(app_token=app_token, app=app)
 
         if threading.current_thread() is threading.main_thread():
-            handler.start()
+            signal.signal(signal.SIGTERM, _exit_on_sigterm)
+            try:
+                handler.start()
+            finally:
+                # Ctrl+C or SIGTERM: enqueue the jobs of events that were already acked
+                scheduler_stop.set()
+                flush_pending_jobs()
         else:
             handler.connect()
             try:
@@ -493,7 +741,9 @@ def main():
                     time.sleep(1)
             except KeyboardInterrupt:
                 logger.info("🛑 Bot thread interrupted")
+                scheduler_stop.set()
                 handler.disconnect()
+                flush_pending_jobs()
 
     except Exception as e:
         logger.error(f"Error in main: {str(e)}")
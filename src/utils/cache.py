@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Small in-process caches shared by the listeners.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used key beyond maxsize.
+
+    With a ttl (seconds), entries also expire that long after they were set.
+    Supports the dict operations the trackers use (``[]``, ``in``, ``get``,
+    assignment) so it can replace a plain dict in place.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        """Return the live (value, expires_at) entry for key, or None. Caller holds the lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _entry(self, key):
+        """Return the live entry for key, trying _load() outside the lock on a miss"""
+        with self._lock:
+            entry = self._lookup(key)
+        if entry is None:
+            entry = self._load(key)
+        return entry
+
+    def _load(self, key):
+        """Return an entry for a key missing from memory; subclasses with a backing store override this"""
+        return None
+
+    def _persist(self, items):
+        """Write (key, value) pairs through to a backing store; nothing to do in memory"""
+
+    def get(self, key, default=None):
+        entry = self._entry(key)
+        return default if entry is None else entry[0]
+
+    def __getitem__(self, key):
+        entry = self._entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def _store(self, key, value, ttl=None):
+        """Set key and evict as needed; ttl overrides self.ttl. Caller holds the lock."""
+        now = time.monotonic()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        # Drop expired entries from the cold end, then enforce the size cap
+        while self._data:
+            _, (_, oldest_expiry) = next(iter(self._data.items()))
+            if oldest_expiry is None or oldest_expiry > now:
+                break
+            self._data.popitem(last=False)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._store(key, value)
+        self._persist(((key, value),))
+
+    def set(self, key, value, ttl=None):
+        """Set key, with ttl overriding the cache-wide ttl for this entry"""
+        with self._lock:
+            self._store(key, value, ttl)
+        self._persist(((key, value),))
+
+    def update(self, items, ttl=None):
+        """Set every (key, value) pair in items under one lock acquisition"""
+        items = list(items)
+        with self._lock:
+            for key, value in items:
+                self._store(key, value, ttl)
+        self._persist(items)
+
+    def items(self):
+        """Return a list of the live (key, value) pairs, least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._data.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def add(self, key, value=True):
+        """Set key only if it has no live entry; return True if it was added"""
+        with self._lock:
+            if self._lookup(key) is not None:
+                return False
+            self._store(key, value)
+            return True
+
+    def discard(self, key):
+        """Remove key if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key):
+        return self._entry(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class PersistentLRUCache(LRUCache):
+    """LRUCache that writes every entry through to a SQLite table.
+
+    The in-memory LRU stays the fast path; a key that is not in memory (evicted,
+    or set before a restart or by another process sharing the file) is looked up
+    in the table and brought back into memory. Keys and values must be
+    JSON-serializable; values are rebuilt with value_type(*row) when given, so
+    NamedTuples round-trip. Rows older than ttl are ignored, and removed by
+    sweep(), which also runs when the cache is opened.
+
+    Keys the table did not have are remembered for miss_ttl seconds, so repeated
+    lookups of a key that was never stored cost one SELECT rather than one each.
+    Writes through this instance clear the remembered miss at once; a row written
+    by another process is seen once the miss expires.
+
+    SQLite is only touched outside the in-memory lock (under its own _db_lock),
+    so a slow read or write never holds up lookups that hit memory.
+    """
+
+    def __init__(self, maxsize, path, table="cache", ttl=None, value_type=None, miss_ttl=60):
+        super().__init__(maxsize, ttl)
+        self.value_type = value_type
+        self._misses = LRUCache(maxsize, ttl=miss_ttl) if miss_ttl else None
+        self._table = table
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit; one connection shared by all threads, serialized by _db_lock
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db_lock = threading.Lock()
+        with self._db_lock:
+            # WAL lets readers in other processes proceed during a write, and with
+            # synchronous=NORMAL a commit no longer waits on an fsync
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_created ON {table} (created)")
+        self.sweep()
+
+    def sweep(self):
+        """Delete rows older than ttl from the table and return how many were removed"""
+        if self.ttl is None:
+            return 0
+        with self._db_lock:
+            cursor = self._db.execute(
+                f"DELETE FROM {self._table} WHERE created < ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def _miss(self, key):
+        """Remember that the table has no live row for key, and return None"""
+        if self._misses is not None:
+            self._misses[key] = True
+        return None
+
+    def _load(self, key):
+        if self._misses is not None and key in self._misses:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                f"SELECT value, created FROM {self._table} WHERE key = ?", (json.dumps(key),)
+            ).fetchone()
+        if row is None:
+            return self._miss(key)
+        ttl = None
+        if self.ttl is not None:
+            ttl = row[1] + self.ttl - time.time()
+            if ttl <= 0:
+                return self._miss(key)
+        value = json.loads(row[0])
+        if self.value_type is not None:
+            value = self.value_type(*value)
+        with self._lock:
+            # A value set while we were reading the table wins over the stored row
+            entry = self._lookup(key)
+            if entry is None:
+                self._store(key, value, ttl)
+                entry = (value, None)
+        return entry
+
+    def _persist(self, items):
+        if self._misses is not None:
+            for key, _ in items:
+                self._misses.discard(key)
+        now = time.time()
+        with self._db_lock:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, created) VALUES (?, ?, ?)",
+                [(json.dumps(key), json.dumps(value), now) for key, value in items]
+            )
+
+    def add(self, key, value=True):
+        """Set key only if neither memory nor the table has a live entry; return True if added"""
+        if self._entry(key) is not None:
+            return False
+        with self._lock:
+            if self._lookup(key) is not None:
+                return False
+            self._store(key, value)
+        self._persist(((key, value),))
+        return True
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+Slack channel naming conventions shared by channel discovery, mapping and the listeners.
+"""
+
+# Source channel name suffixes, by the kind of master channel they forward to
+ADMIN_SUFFIXES = ("-admin", "-admins")
+AGENT_SUFFIXES = ("-agent", "-agents")
+APPTBK_SUFFIXES = ("-apptbk",)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Wall-clock schedule for the listeners' channel mapping updates.
+
+Every bot process refreshes at the same UTC hours regardless of when it was
+started, with a little jitter so the bots do not all hit Slack at once. The
+scheduler waits on an Event rather than sleeping, so shutdown stops it promptly.
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+# Channel mapping updates run at these UTC hours
+CLIENT_LIST_ANCHOR_HOURS = (6, 18)
+# Up to this many seconds of random delay after each anchor
+CLIENT_LIST_JITTER = 30
+# Seconds before retrying after an update raised
+CLIENT_LIST_RETRY_DELAY = 3600
+
+# Bots other than Bot 1 only reload the files Bot 1 writes, so their first update
+# waits this long rather than competing with the Socket Mode connect at startup
+FOLLOWER_STARTUP_DELAY = 45
+
+
+def next_client_list_run(now):
+    """Return the first anchor time (UTC) strictly after `now`"""
+    today = now.replace(minute=0, second=0, microsecond=0)
+    for day in (0, 1):
+        for hour in CLIENT_LIST_ANCHOR_HOURS:
+            candidate = today.replace(hour=hour) + timedelta(days=day)
+            if candidate > now:
+                return candidate
+
+
+def run_client_list_scheduler(update, stop, leader):
+    """Call update() now and then at every anchor time until stop (an Event) is set.
+
+    Followers (leader False) defer the first update by FOLLOWER_STARTUP_DELAY.
+    """
+    logger.info("🕐 Channel mapping scheduler started - will update at %s UTC",
+                " and ".join(f"{hour:02d}:00" for hour in CLIENT_LIST_ANCHOR_HOURS))
+
+    # Run initial update (deferred on follower bots)
+    if not leader and stop.wait(FOLLOWER_STARTUP_DELAY):
+        return
+    update()
+
+    retry_delay = None
+    while True:
+        try:
+            if retry_delay is None:
+                now = datetime.now(timezone.utc)
+                next_update = next_client_list_run(now)
+                delay = (next_update - now).total_seconds() + random.uniform(0, CLIENT_LIST_JITTER)
+                logger.info(f"⏰ Next channel mapping update scheduled for: {next_update.strftime('%Y-%m-%d %I:%M:%S %p %Z')}")
+            else:
+                delay, retry_delay = retry_delay, None
+
+            if stop.wait(delay):
+                return
+            update()
+        except Exception as e:
+            logger.error(f"❌ Error in client list scheduler: {str(e)}")
+            logger.info("⏰ Retrying in 1 hour due to error...")
+            retry_delay = CLIENT_LIST_RETRY_DELAY
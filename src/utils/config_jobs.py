@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Run the channel discovery and mapping jobs out of process.
+
+Discovery and mapping walk the Slack and ClickUp APIs for minutes at a time. The
+listeners run them in a child interpreter instead of on their scheduler thread, so
+that work never competes with the Slack event handlers for the GIL. The jobs hand
+their results back through the files in data/, which the listeners reload afterwards.
+"""
+
+import os
+import subprocess
+import sys
+
+# Seconds a job may run before it is killed
+CONFIG_JOB_TIMEOUT = int(os.environ.get("CONFIG_JOB_TIMEOUT", str(30 * 60)))
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def run_config_job(module):
+    """Run `python -m module` in a child process and return True if it exits cleanly.
+
+    The child shares this process's environment and working directory. Raises
+    subprocess.TimeoutExpired (after killing the child) if it runs past
+    CONFIG_JOB_TIMEOUT, or OSError if it cannot be started.
+    """
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    result = subprocess.run([sys.executable, "-m", module], env=env, timeout=CONFIG_JOB_TIMEOUT)
+    return result.returncode == 0
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Startup validation of the master channels, shared by both listeners.
+
+Validation is cached in a file for a day, so a restart (e.g. a crash loop) skips
+the Slack lookups. On a miss, one users_conversations listing normally covers
+every master channel; only channels the bot has not joined need their own
+conversations_info, and those are issued together.
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from slack_sdk.errors import SlackApiError
+
+logger = logging.getLogger(__name__)
+
+# Master channels validated within this window are not looked up again on restart
+MASTER_CHANNELS_CACHE_FILE = 'data/master_channels.json'
+MASTER_CHANNELS_CACHE_TTL = 24 * 60 * 60
+
+
+def load_validated_master_channels(channel_ids):
+    """Return {channel_id: name} from the last validation if it covers channel_ids and is fresh"""
+    try:
+        with open(MASTER_CHANNELS_CACHE_FILE, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    names = data.get("channels", {})
+    if time.time() - data.get("validated_at", 0) > MASTER_CHANNELS_CACHE_TTL:
+        return None
+    if not all(channel_id in names for channel_id in channel_ids):
+        return None
+    return names
+
+
+def save_validated_master_channels(names):
+    """Record the master channels that just passed validation"""
+    try:
+        with open(MASTER_CHANNELS_CACHE_FILE, 'w') as f:
+            json.dump({"validated_at": time.time(), "channels": names}, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not save {MASTER_CHANNELS_CACHE_FILE}: {e}")
+
+
+def get_joined_channels(client, user_id):
+    """Return {channel_id: name} for every channel user_id is a member of, via users_conversations pages"""
+    joined = {}
+    cursor = None
+    while True:
+        response = client.users_conversations(
+            user=user_id,
+            types="public_channel,private_channel",
+            exclude_archived=True,
+            limit=1000,
+            cursor=cursor
+        )
+        joined.update((channel["id"], channel["name"]) for channel in response["channels"])
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return joined
+
+
+def validate_master_channels(client, master_channels, get_user_id=None, pool=None):
+    """Check that every (label, channel_id) in master_channels is accessible; return {channel_id: name}.
+
+    get_user_id returns the bot's user ID (auth_test when not given); it is only
+    called on a cache miss. The conversations_info lookups run on pool, or on a
+    pool of their own. Raises SlackApiError if a channel cannot be read.
+    """
+    cached = load_validated_master_channels([channel_id for _, channel_id in master_channels])
+    if cached:
+        for label, channel_id in master_channels:
+            logger.info(f"{label} master channel validated (cached): {cached[channel_id]}")
+        return cached
+
+    try:
+        user_id = get_user_id() if get_user_id else client.auth_test()["user_id"]
+        joined = get_joined_channels(client, user_id)
+    except SlackApiError as e:
+        logger.warning("Could not list the bot's channels, looking up each master channel: %s", e.response["error"])
+        joined = {}
+    names = {channel_id: joined[channel_id] for _, channel_id in master_channels if channel_id in joined}
+    missing = [channel_id for _, channel_id in master_channels if channel_id not in names]
+
+    if missing:
+        own_pool = None
+        if pool is None:
+            pool = own_pool = ThreadPoolExecutor(max_workers=len(missing), thread_name_prefix="master-channels")
+        try:
+            # map() re-raises the first failure in order when its result is reached
+            results = pool.map(lambda channel_id: client.conversations_info(channel=channel_id), missing)
+            for channel_id, info in zip(missing, results):
+                names[channel_id] = info['channel']['name']
+        except SlackApiError as e:
+            logger.error(f"Error validating master channels: {e.response['error']}")
+            raise
+        finally:
+            if own_pool is not None:
+                own_pool.shutdown()
+
+    for label, channel_id in master_channels:
+        logger.info(f"{label} master channel validated: {names[channel_id]}")
+
+    save_validated_master_channels(names)
+    return names
@@ -3,6 +3,11 @@ import requests
 from dotenv import load_dotenv
 import json
 
+try:
+    from .channel_names import ADMIN_SUFFIXES
+except ImportError:
+    from channel_names import ADMIN_SUFFIXES
+
 # Load environment variables
 load_dotenv()
 
@@ -66,7 +71,7 @@ class SlackChannelFetcher:
             channel_name = channel.get("name", "")
             
             # Check if channel name ends with -admin or -admins
-            if channel_name.endswith("-admin") or channel_name.endswith("-admins"):
+            if channel_name.endswith(ADMIN_SUFFIXES):
                 admin_channels.append({
                     "id": channel["id"],
                     "name": channel_name,
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Shared Slack WebClient construction.
+
+Every process talks to the same Slack API host, so clients are built here with
+one shared SSL context and a fixed timeout instead of the SDK defaults, and every
+call is paced against Slack's per-method rate limits before it is sent. When
+Slack still answers 429, the call's bucket is held for the Retry-After so the
+other threads wait it out instead of hitting the same limit again.
+"""
+
+import os
+import ssl
+import threading
+import time
+
+from slack_sdk import WebClient
+from slack_sdk.http_retry import (
+    BackoffRetryIntervalCalculator,
+    ConnectionErrorRetryHandler,
+    RateLimitErrorRetryHandler,
+)
+from slack_sdk.http_retry.builtin_handlers import ServerErrorRetryHandler
+
+# Seconds before a Slack API call is abandoned
+SLACK_TIMEOUT = int(os.environ.get("SLACK_TIMEOUT", "30"))
+
+# Loading the CA bundle is the expensive part of TLS setup. With ssl=None the
+# SDK's urlopen builds a fresh default context (and re-reads the CA store) for
+# every request, so build it once per process and share it across clients.
+_ssl_context = ssl.create_default_context()
+
+# How many times a call that hit a connection reset or timeout is retried. Posts
+# are not idempotent, but a lost forward is worse than a rare duplicate.
+CONNECTION_RETRIES = 2
+
+# How many times a call that hit a Slack server error is retried, backing off
+# 1s, 2s, 4s between attempts
+SERVER_ERROR_RETRIES = 3
+
+# Errors Slack can answer with on an HTTP 200 that are worth retrying like a 5xx
+TRANSIENT_ERRORS = frozenset(("internal_error", "unknown_error", "fatal_error", "service_unavailable"))
+
+# How many times a call answered with HTTP 429 is retried after sleeping for the
+# Retry-After the response asks for
+RATE_LIMIT_RETRIES = 2
+
+# Slack API method -> (calls, per seconds[, "channel"]). Budgets follow Slack's
+# published tiers; a third "channel" element keeps one bucket per channel instead
+# of one per method. Methods not listed here are not paced.
+BUCKETS = {
+    "conversations.history": (50, 60),         # Tier 3
+    "conversations.list": (20, 60),            # Tier 2
+    "conversations.info": (50, 60),            # Tier 3
+    "conversations.replies": (50, 60),         # Tier 3
+    "conversations.invite": (50, 60),          # Tier 3
+    "conversations.members": (100, 60),        # Tier 4
+    "users.conversations": (50, 60),           # Tier 3
+    "files.info": (100, 60),                   # Tier 4
+    "files.getUploadURLExternal": (100, 60),   # Tier 4
+    "files.completeUploadExternal": (100, 60), # Tier 4
+    "chat.update": (50, 60),                   # Tier 3
+    "chat.postMessage": (1, 1, "channel"),     # Special: ~1 message/s per channel
+}
+
+
+class MethodLimiter:
+    """Token buckets keyed by Slack API method (and channel, where configured).
+
+    acquire() reserves a token and sleeps outside the lock until it is due, so
+    callers on the same bucket are released in the order they arrived and callers
+    on other buckets are never held up.
+    """
+
+    def __init__(self, buckets=None):
+        self.buckets = BUCKETS if buckets is None else buckets
+        self._state = {}  # (method, channel) -> [tokens, last_refill]
+        self._lock = threading.Lock()
+
+    def _bucket(self, method, channel):
+        """Return (key, capacity, rate) of the bucket for a call, or None if it is not paced"""
+        spec = self.buckets.get(method)
+        if spec is None:
+            return None
+        capacity, period = spec[0], spec[1]
+        per_channel = len(spec) > 2 and spec[2] == "channel"
+        return (method, channel if per_channel else None), capacity, capacity / period
+
+    def _refill(self, key, capacity, rate, now):
+        """Return the bucket's state and its tokens as of now. Caller holds the lock."""
+        state = self._state.get(key)
+        if state is None:
+            state = self._state[key] = [float(capacity), now]
+        return state, min(capacity, state[0] + (now - state[1]) * rate)
+
+    def acquire(self, method, channel=None):
+        bucket = self._bucket(method, channel)
+        if bucket is None:
+            return
+        key, capacity, rate = bucket
+
+        with self._lock:
+            now = time.monotonic()
+            state, tokens = self._refill(key, capacity, rate, now)
+            # Take the token now, even if that leaves the bucket in debt; the debt
+            # is how long this caller has to wait before using it
+            tokens -= 1
+            state[0], state[1] = tokens, now
+
+        if tokens < 0:
+            time.sleep(-tokens / rate)
+
+    def pause(self, method, channel, seconds):
+        """Hold the bucket for a call so that its next caller waits at least seconds"""
+        bucket = self._bucket(method, channel)
+        if bucket is None:
+            return
+        key, capacity, rate = bucket
+
+        with self._lock:
+            now = time.monotonic()
+            state, tokens = self._refill(key, capacity, rate, now)
+            # Leave seconds * rate of debt once the next caller has taken its token
+            state[0], state[1] = min(tokens, 1 - seconds * rate), now
+
+
+class RateLimitedWebClient(WebClient):
+    """WebClient that waits on a MethodLimiter before issuing each API call"""
+
+    def __init__(self, *args, limiter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = limiter or MethodLimiter()
+        # (method, channel) of the call in flight on each thread, for rate_limited()
+        self._current = threading.local()
+
+    def api_call(self, api_method, **kwargs):
+        channel = None
+        for body in (kwargs.get("json"), kwargs.get("params"), kwargs.get("data")):
+            if isinstance(body, dict) and body.get("channel"):
+                channel = body["channel"]
+                break
+        self.limiter.acquire(api_method, channel)
+        self._current.call = (api_method, channel)
+        try:
+            return super().api_call(api_method, **kwargs)
+        finally:
+            # A later 429 on this thread from a request outside api_call (e.g. the
+            # files_upload_v2 upload PUT) must not pause this method's bucket
+            self._current.call = None
+
+    def rate_limited(self, retry_after):
+        """Pause the bucket of this thread's call in flight, which Slack just answered with 429"""
+        call = getattr(self._current, "call", None)
+        # A request that did not go through api_call has no bucket to pause
+        if call is None:
+            return
+        method, channel = call
+        self.limiter.pause(method, channel, retry_after)
+
+
+class PausingRateLimitRetryHandler(RateLimitErrorRetryHandler):
+    """RateLimitErrorRetryHandler that reports each 429 to a callback before sleeping.
+
+    The callback gets the Retry-After in seconds (1 if Slack sent none).
+    """
+
+    def __init__(self, on_rate_limited, max_retry_count=1):
+        super().__init__(max_retry_count=max_retry_count)
+        self.on_rate_limited = on_rate_limited
+
+    def prepare_for_next_attempt(self, *, state, request, response=None, error=None):
+        if response is not None:
+            retry_after = 1
+            for name, value in response.headers.items():
+                if name.lower() == "retry-after":
+                    retry_after = int(value[0] if isinstance(value, list) else value)
+                    break
+            self.on_rate_limited(retry_after)
+        super().prepare_for_next_attempt(state=state, request=request, response=response, error=error)
+
+
+class TransientErrorRetryHandler(ServerErrorRetryHandler):
+    """ServerErrorRetryHandler for any 5xx, and for TRANSIENT_ERRORS sent with a 200"""
+
+    def _can_retry(self, *, state, request, response=None, error=None):
+        if response is None:
+            return False
+        if response.status_code >= 500:
+            return True
+        return (response.body or {}).get("error") in TRANSIENT_ERRORS
+
+
+def create_web_client(token):
+    """Create a rate-limited WebClient that reuses the process-wide SSL context.
+
+    Connection resets are retried up to CONNECTION_RETRIES times, Slack server
+    errors up to SERVER_ERROR_RETRIES times with exponential backoff, and 429
+    responses after the Retry-After delay, so a transient failure or a limit
+    the token buckets missed stalls the call instead of failing it. The 429 also pauses
+    the call's bucket, so the client's other threads wait out the same delay.
+    """
+    client = RateLimitedWebClient(
+        token=token,
+        ssl=_ssl_context,
+        timeout=SLACK_TIMEOUT,
+        retry_handlers=[
+            ConnectionErrorRetryHandler(max_retry_count=CONNECTION_RETRIES),
+            TransientErrorRetryHandler(
+                max_retry_count=SERVER_ERROR_RETRIES,
+                interval_calculator=BackoffRetryIntervalCalculator(backoff_factor=1.0),
+            ),
+        ],
+    )
+    client.retry_handlers.append(
+        PausingRateLimitRetryHandler(client.rate_limited, max_retry_count=RATE_LIMIT_RETRIES)
+    )
+    return client
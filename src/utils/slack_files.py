@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Rehost files shared in a source channel into a master channel.
+
+A forwarded file card links to the source file's url_private, which only opens for
+members who can already see the source channel, and image previews built from it
+never render. With REHOST_FILES on, the listeners download each file with the bot
+token and upload it to the master channel with files_upload_v2 instead.
+"""
+
+import logging
+import os
+
+import requests
+
+from utils.slack_client import SLACK_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Upload shared files to the master channel instead of linking them from a card
+REHOST_FILES = os.environ.get("REHOST_FILES", "false").lower() == "true"
+
+
+def download_file(token, url):
+    """Return the bytes behind a Slack url_private, authenticated as the bot"""
+    response = requests.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=SLACK_TIMEOUT)
+    response.raise_for_status()
+    # Slack answers an unauthorized download with its sign-in page instead of an error
+    if response.headers.get("Content-Type", "").startswith("text/html"):
+        raise requests.HTTPError(f"got a sign-in page instead of the file at {url}")
+    return response.content
+
+
+def _download(token, file):
+    """Return (content, None) or (None, error) for one file"""
+    try:
+        return download_file(token, file["url_private"]), None
+    except requests.RequestException as e:
+        return None, e
+
+
+def rehost_files(client, files, channel, thread_ts=None, pool=None):
+    """Upload files (objects with name and url_private) to channel; return how many were uploaded.
+
+    Several files are downloaded side by side on pool when one is given, and then
+    sent in a single files_upload_v2 call. A file that cannot be downloaded is
+    logged and left out; SlackApiError from the upload propagates.
+    """
+    if pool is not None and len(files) > 1:
+        results = pool.map(lambda file: _download(client.token, file), files)
+    else:
+        results = (_download(client.token, file) for file in files)
+
+    uploads = []
+    for file, (content, error) in zip(files, results):
+        if error:
+            logger.error("Error downloading file %s: %s", file["name"], error)
+            continue
+        uploads.append({"content": content, "filename": file["name"], "title": file["name"]})
+
+    if uploads:
+        client.files_upload_v2(channel=channel, file_uploads=uploads, thread_ts=thread_ts)
+    return len(uploads)
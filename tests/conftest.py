@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures: an in-process Slack API and a scratch working directory.
+"""
+
+import pytest
+
+
+class SlackCalls(list):
+    """Recorded (method, params) calls. A test may set `before` to a callable run with
+    (method, params) ahead of each call; a dict it returns is merged into the response."""
+    before = None
+
+ENV = {
+    "BOT_ID": "1",
+    "SLACK_BOT_TOKEN": "xoxb-test",
+    "SLACK_APP_TOKEN": "xapp-test",
+    "AGENT_MASTER_CHANNEL_ID": "CAGENT",
+    "APPTBK_MASTER_CHANNEL_ID": "CAPPT",
+    "MANAGED_ADMIN_MASTER_CHANNEL_ID": "CMAN",
+    "STORM_ADMIN_MASTER_CHANNEL_ID": "CSTORM",
+    # Nothing listens here, so the listener falls back to in-memory dedup
+    "REDIS_HOST": "127.0.0.1",
+    "REDIS_PORT": "1",
+}
+
+
+@pytest.fixture(scope="module")
+def slack_api(tmp_path_factory):
+    """Answer Slack API calls in-process from a scratch working directory; yields the recorded calls"""
+    from slack_sdk import WebClient
+    from slack_sdk.web import SlackResponse
+
+    calls = SlackCalls()
+
+    def api_call(self, api_method, **kwargs):
+        params = kwargs.get("json") or kwargs.get("params") or kwargs.get("data") or {}
+        extra = calls.before(api_method, params) if calls.before else None
+        calls.append((api_method, dict(params)))
+        data = {"ok": True}
+        if api_method == "auth.test":
+            data.update(user_id="UBOT", bot_id="BBOT", team_id="T1", url="https://test.slack.com/")
+        elif api_method == "chat.postMessage":
+            data["ts"] = f"900.{len(calls)}"
+        if extra:
+            data.update(extra)
+        return SlackResponse(client=self, http_verb="POST", api_url=api_method, req_args=kwargs,
+                             data=data, headers={}, status_code=200)
+
+    patch = pytest.MonkeyPatch()
+    patch.setattr(WebClient, "api_call", api_call)
+    for name, value in ENV.items():
+        patch.setenv(name, value)
+    workdir = tmp_path_factory.mktemp("listener")
+    (workdir / "data").mkdir()
+    patch.chdir(workdir)
+    yield calls
+    patch.undo()
+
+
+@pytest.fixture
+def fake_redis():
+    """An in-process Redis that runs Lua scripts; skips without fakeredis[lua]"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis(decode_responses=True)
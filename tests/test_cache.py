@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Behaviour of the in-process caches in utils.cache.
+"""
+
+import os
+import sys
+import time
+from typing import NamedTuple
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.cache import LRUCache, PersistentLRUCache
+
+
+class Tracked(NamedTuple):
+    ts: str
+    target_channel: str
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    # Reading "a" makes "b" the least recently used
+    assert cache["a"] == 1
+    cache["c"] = 3
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_entries_expire_after_ttl():
+    cache = LRUCache(maxsize=10, ttl=0.05)
+    cache["a"] = 1
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    assert cache.items() == [("b", 2)]
+
+
+def test_lru_add_only_sets_missing_keys():
+    cache = LRUCache(maxsize=10, ttl=0.05)
+    assert cache.add("a")
+    assert not cache.add("a")
+
+    time.sleep(0.1)
+
+    # An expired entry no longer blocks the key
+    assert cache.add("a")
+
+
+def test_persistent_cache_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = PersistentLRUCache(maxsize=10, path=path, table="tracker", value_type=Tracked)
+    first[("C1", "1.0")] = Tracked("900.1", "CMASTER")
+    first.update([("x", Tracked("900.2", "CMASTER"))])
+
+    second = PersistentLRUCache(maxsize=10, path=path, table="tracker", value_type=Tracked)
+
+    assert second.get(("C1", "1.0")) == Tracked("900.1", "CMASTER")
+    assert second["x"] == Tracked("900.2", "CMASTER")
+    assert not second.add("x")
+
+
+def test_persistent_cache_reloads_evicted_keys(tmp_path):
+    cache = PersistentLRUCache(maxsize=1, path=str(tmp_path / "cache.db"))
+    cache["a"] = 1
+    cache["b"] = 2
+
+    # "a" fell out of memory but is still in the table
+    assert cache.get("a") == 1
+
+
+def test_persistent_cache_ignores_and_sweeps_expired_rows(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = PersistentLRUCache(maxsize=10, path=path, ttl=0.05)
+    first["a"] = 1
+
+    time.sleep(0.1)
+
+    second = PersistentLRUCache(maxsize=10, path=path, ttl=0.05)
+    assert second.get("a") is None
+    # Opening the cache already swept the stale row
+    assert second.sweep() == 0
+
+
+def test_persistent_cache_remembers_misses_until_the_key_is_set(tmp_path):
+    cache = PersistentLRUCache(maxsize=1, path=str(tmp_path / "cache.db"))
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert len([sql for sql in statements if sql.startswith("SELECT")]) == 1
+
+    cache["a"] = 1
+    cache["b"] = 2
+
+    # "a" was evicted from memory, and setting it forgot the remembered miss
+    assert cache.get("a") == 1
+
+
+def test_persistent_cache_sees_other_writers_after_the_miss_expires(tmp_path):
+    path = str(tmp_path / "cache.db")
+    reader = PersistentLRUCache(maxsize=10, path=path, miss_ttl=0.05)
+    writer = PersistentLRUCache(maxsize=10, path=path)
+
+    assert reader.get("a") is None
+    writer["a"] = 1
+    time.sleep(0.1)
+
+    assert reader.get("a") == 1
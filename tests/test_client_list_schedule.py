@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Wall-clock anchoring and shutdown of the channel mapping scheduler.
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import client_list_schedule
+from utils.client_list_schedule import next_client_list_run, run_client_list_scheduler
+
+
+def utc(day, hour, minute=0):
+    return datetime(2026, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+def test_next_run_is_the_next_anchor_hour():
+    assert next_client_list_run(utc(1, 2, 30)) == utc(1, 6)
+    assert next_client_list_run(utc(1, 6, 0)) == utc(1, 18)
+    assert next_client_list_run(utc(1, 12)) == utc(1, 18)
+    assert next_client_list_run(utc(1, 19)) == utc(2, 6)
+
+
+def test_leader_updates_at_once_and_stops_when_asked():
+    stop = threading.Event()
+    updates = []
+
+    def update():
+        updates.append(True)
+        stop.set()
+
+    thread = threading.Thread(target=run_client_list_scheduler, args=(update, stop, True))
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert updates == [True]
+
+
+def test_follower_stopped_during_its_startup_delay_never_updates(monkeypatch):
+    monkeypatch.setattr(client_list_schedule, "FOLLOWER_STARTUP_DELAY", 60)
+    stop = threading.Event()
+    updates = []
+
+    thread = threading.Thread(target=run_client_list_scheduler, args=(lambda: updates.append(True), stop, False))
+    thread.start()
+    stop.set()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert updates == []
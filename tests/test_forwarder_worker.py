@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Thread parent claims in the forwarder worker, run against an in-process Redis.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("slack_sdk")
+pytest.importorskip("redis")
+pytest.importorskip("dotenv")
+
+PAYLOAD = {
+    "source_channel_id": "C3",
+    "source_channel_name": "bob-agents",
+    "target_channel_id": "CAGENT",
+    "thread_ts": "5.0",
+}
+
+
+@pytest.fixture
+def forwarder(slack_api, fake_redis, monkeypatch):
+    """core.forwarder_worker with its parent scripts registered on fake_redis"""
+    from core import forwarder_worker as module
+    monkeypatch.setattr(module, "r", fake_redis)
+    for name in ("CLAIM_PARENT", "REFRESH_PARENT", "RELEASE_PARENT"):
+        monkeypatch.setattr(module, name, fake_redis.register_script(getattr(module, name).script))
+    return module
+
+
+class FakeClient:
+    """Answers the two calls ensure_parent_posted makes, counting the posts"""
+
+    def __init__(self, post_delay=0.0, error=None):
+        self.post_delay = post_delay
+        self.error = error
+        self.posts = []
+        self._lock = threading.Lock()
+
+    def conversations_replies(self, channel, ts, limit):
+        if self.error:
+            from slack_sdk.errors import SlackApiError
+            raise SlackApiError(self.error, {"ok": False, "error": self.error})
+        return {"messages": [{"ts": ts, "user": "U1", "text": "parent"}]}
+
+    def chat_postMessage(self, channel, text):
+        time.sleep(self.post_delay)
+        with self._lock:
+            self.posts.append(text)
+            return {"ts": f"900.{len(self.posts)}"}
+
+
+def run_concurrently(target, count):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_replies_post_the_parent_once(forwarder):
+    client = FakeClient(post_delay=0.3)
+
+    results = run_concurrently(lambda: forwarder.ensure_parent_posted(client, PAYLOAD), 5)
+
+    assert len(client.posts) == 1
+    assert results == ["900.1"] * 5
+    assert forwarder.get_master_ts_for_parent("C3", "5.0") == "900.1"
+
+
+def test_failed_parent_post_releases_the_claim(forwarder):
+    assert forwarder.ensure_parent_posted(FakeClient(error="ratelimited"), PAYLOAD) is None
+    assert forwarder.get_master_ts_for_parent("C3", "5.0") is None
+
+    client = FakeClient()
+    assert forwarder.ensure_parent_posted(client, PAYLOAD) == "900.1"
+    assert len(client.posts) == 1
+
+
+def test_claim_outlives_its_ttl_while_the_post_is_in_flight(forwarder, monkeypatch):
+    monkeypatch.setattr(forwarder, "PARENT_PENDING_TTL_SEC", 1)
+    monkeypatch.setattr(forwarder, "PARENT_PENDING_REFRESH_SEC", 0.2)
+    client = FakeClient(post_delay=2.5)
+
+    owner = threading.Thread(target=forwarder.ensure_parent_posted, args=(client, PAYLOAD))
+    owner.start()
+    # Well past the marker's TTL, another reply still finds the claim held
+    time.sleep(1.5)
+    assert forwarder.ensure_parent_posted(client, PAYLOAD) == "900.1"
+    owner.join()
+
+    assert len(client.posts) == 1
+
+
+def test_waiters_give_up_once_an_abandoned_claim_lapses(forwarder, fake_redis):
+    fake_redis.set(forwarder.map_parent_key("C3", "5.0"), forwarder.PARENT_PENDING, ex=1)
+
+    started = time.monotonic()
+    assert forwarder.wait_for_parent("C3", "5.0") is None
+    assert time.monotonic() - started < 3
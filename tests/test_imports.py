@@ -6,42 +6,43 @@ Test script to verify all imports work correctly after reorganization
 import sys
 import os
 
+import pytest
+
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 def test_core_imports():
     """Test core module imports"""
-    try:
-        from core import listener
-        from core import multi_bot_launcher
-        print("PASS: Core imports successful")
-        return True
-    except ImportError as e:
-        print(f"FAIL: Core import failed: {e}")
-        return False
+    for dependency in ("dotenv", "redis", "slack_bolt"):
+        pytest.importorskip(dependency)
+    # Importing the listener builds the Bolt app, which needs a bot to sign in as
+    if not os.environ.get("SLACK_BOT_TOKEN"):
+        pytest.skip("SLACK_BOT_TOKEN is not set")
+    from core import listener
+    from core import multi_bot_launcher
+    print("PASS: Core imports successful")
 
 def test_config_imports():
     """Test config module imports"""
-    try:
-        from config import multi_bot_config
-        from config import channel_discovery
-        from config import channel_mapper
-        print("PASS: Config imports successful")
-        return True
-    except ImportError as e:
-        print(f"FAIL: Config import failed: {e}")
-        return False
+    for dependency in ("dotenv", "requests"):
+        pytest.importorskip(dependency)
+    from config import multi_bot_config
+    from config import channel_discovery
+    from config import channel_mapper
+    print("PASS: Config imports successful")
 
 def test_utils_imports():
     """Test utils module imports"""
-    try:
-        from utils import clickup_client_fetcher
-        from utils import slack_channel_fetcher
-        print("PASS: Utils imports successful")
-        return True
-    except ImportError as e:
-        print(f"FAIL: Utils import failed: {e}")
-        return False
+    for dependency in ("dotenv", "requests", "slack_sdk"):
+        pytest.importorskip(dependency)
+    from utils import clickup_client_fetcher
+    from utils import slack_channel_fetcher
+    from utils import slack_client
+    from utils import cache
+    from utils import config_jobs
+    from utils import slack_files
+    from utils import channel_names
+    print("PASS: Utils imports successful")
 
 def main():
     """Run all import tests"""
@@ -56,7 +57,14 @@ def main():
     
     results = []
     for test in tests:
-        results.append(test())
+        try:
+            test()
+            results.append(True)
+        except pytest.skip.Exception as e:
+            print(f"SKIP: {test.__name__}: {e}")
+        except Exception as e:
+            print(f"FAIL: {test.__name__}: {e}")
+            results.append(False)
     
     print("=" * 50)
     if all(results):
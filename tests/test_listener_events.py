@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Dispatch Slack event payloads through the listener's Bolt app.
+
+Slack API calls are answered in-process, so no network or Redis is needed.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("slack_bolt")
+pytest.importorskip("redis")
+pytest.importorskip("dotenv")
+
+
+@pytest.fixture(scope="module")
+def listener(slack_api):
+    """Import core.listener against the fake Slack API; yields (module, recorded calls)"""
+    from core import listener as module
+    atexit.unregister(module.save_channel_names_snapshot)
+    module.channel_name_cache["C3"] = "bob-agents"
+    return module, slack_api
+
+
+@pytest.fixture(scope="module")
+def redis_listener(slack_api):
+    """Import core.listener_redis against the fake Slack API; jobs stay queued with no flusher running"""
+    from core import listener_redis as module
+    module.channel_name_cache["C3"] = "bob-agents"
+    return module
+
+
+def dispatch(module, event):
+    from slack_bolt.request import BoltRequest
+
+    body = {
+        "type": "event_callback",
+        "team_id": "T1",
+        "api_app_id": "A1",
+        "event_id": f"Ev{event['event_ts']}",
+        "event_time": 1,
+        "event": event,
+    }
+    return module.app.dispatch(BoltRequest(body=body, mode="socket_mode"))
+
+
+def wait_for(calls, method, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        found = [params for name, params in calls if name == method]
+        if found:
+            return found
+        time.sleep(0.01)
+    return []
+
+
+def test_message_changed_updates_forwarded_copy(listener):
+    module, calls = listener
+    module.message_tracker[("C3", "5.0")] = module.TrackedMsg(ts="800.1", target_channel="CAGENT")
+
+    response = dispatch(module, {
+        "type": "message",
+        "subtype": "message_changed",
+        "channel": "C3",
+        "ts": "6.0",
+        "event_ts": "6.0",
+        "message": {"type": "message", "ts": "5.0", "user": "U1", "text": "edited text", "client_msg_id": "m-edit"},
+        "previous_message": {"type": "message", "ts": "5.0", "user": "U1", "text": "original text"},
+    })
+
+    assert response.status == 200
+    updates = wait_for(calls, "chat.update")
+    assert len(updates) == 1
+    assert updates[0]["channel"] == "CAGENT"
+    assert updates[0]["ts"] == "800.1"
+    assert "edited text" in updates[0]["text"]
+
+
+def test_edit_keeps_file_cards_when_rehosting(listener, monkeypatch):
+    module, calls = listener
+    del calls[:]
+    monkeypatch.setattr(module, "REHOST_FILES", True)
+    module.message_tracker[("C3", "9.0")] = module.TrackedMsg(ts="800.2", target_channel="CAGENT")
+    shared = {"id": "F1", "name": "report.pdf", "url_private": "https://files.slack.com/F1", "mimetype": "application/pdf"}
+
+    dispatch(module, {
+        "type": "message",
+        "subtype": "message_changed",
+        "channel": "C3",
+        "ts": "10.0",
+        "event_ts": "10.0",
+        "message": {"type": "message", "ts": "9.0", "user": "U1", "text": "see file", "files": [shared]},
+        "previous_message": {"type": "message", "ts": "9.0", "user": "U1", "text": "file"},
+    })
+
+    updates = wait_for(calls, "chat.update")
+    assert len(updates) == 1
+    assert [card["title"] for card in updates[0]["attachments"]] == ["report.pdf"]
+    assert not [name for name, _ in calls if name.startswith("files.")]
+
+
+def test_message_deleted_is_not_forwarded(listener):
+    module, calls = listener
+    del calls[:]
+
+    dispatch(module, {
+        "type": "message",
+        "subtype": "message_deleted",
+        "channel": "C3",
+        "ts": "7.0",
+        "event_ts": "7.0",
+        "deleted_ts": "5.0",
+        "previous_message": {"type": "message", "ts": "5.0", "user": "U1", "text": "original text"},
+    })
+
+    time.sleep(0.2)
+    assert [name for name, _ in calls if name.startswith("chat.")] == []
+
+
+def test_redis_listener_queues_update_job_for_message_changed(redis_listener):
+    module = redis_listener
+
+    dispatch(module, {
+        "type": "message",
+        "subtype": "message_changed",
+        "channel": "C3",
+        "ts": "8.0",
+        "event_ts": "8.0",
+        "message": {"type": "message", "ts": "5.0", "user": "U1", "text": "edited text", "client_msg_id": "m-edit"},
+        "previous_message": {"type": "message", "ts": "5.0", "user": "U1", "text": "original text"},
+    })
+
+    key, _, payload, _ = module.pending_jobs.get(timeout=5)
+    assert key == module.build_fcfs_key("message_changed", "C3", "m-edit")
+    assert payload["type"] == "update"
+    assert payload["text"] == "edited text"
+
+
+def test_failed_channel_mapping_falls_back_to_basic_client_lists(listener, monkeypatch):
+    module, _ = listener
+    fallbacks = []
+    monkeypatch.setattr(module, "run_config_job", lambda job: job != "config.channel_mapper")
+    monkeypatch.setattr(module, "update_basic_client_lists", lambda: fallbacks.append(True))
+    monkeypatch.setattr(module, "seed_channel_names", lambda: None)
+
+    module.update_client_lists()
+
+    assert fallbacks == [True]
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def hold_first_post(calls, monkeypatch):
+    """Block the next chat.postMessage until released; returns (entered, release) events"""
+    entered, release = threading.Event(), threading.Event()
+
+    def before(method, params):
+        if method == "chat.postMessage" and not entered.is_set():
+            entered.set()
+            release.wait(5)
+
+    monkeypatch.setattr(calls, "before", before)
+    return entered, release
+
+
+def post_burst(module, calls, monkeypatch, channel, messages):
+    """Dispatch messages while the first one's post is held, so the rest queue behind it.
+
+    Returns the texts of the chat.postMessage calls made once the channel has drained.
+    """
+    del calls[:]
+    entered, release = hold_first_post(calls, monkeypatch)
+    for queued, message in enumerate(messages):
+        dispatch(module, {"type": "message", "channel": channel, "event_ts": message["ts"], **message})
+        if queued == 0:
+            assert entered.wait(5)
+        else:
+            wait_until(lambda: len(module._channel_backlogs.get(channel, ())) == queued)
+    release.set()
+    wait_until(lambda: channel not in module._channel_backlogs)
+    return [params["text"] for name, params in calls if name == "chat.postMessage"]
+
+
+def body(text):
+    """The source text of a forwarded post, without its header and footer"""
+    return text.split("\n", 1)[1].rsplit("\n_Posted by", 1)[0]
+
+
+def test_channel_messages_post_in_arrival_order(listener, monkeypatch):
+    module, calls = listener
+    module.channel_name_cache["C20"] = "ann-agents"
+
+    posts = post_burst(module, calls, monkeypatch, "C20", [
+        {"ts": f"20.{n}", "user": "U1", "text": f"line {n}", "client_msg_id": f"m-order-{n}"}
+        for n in range(1, 5)
+    ])
+
+    assert [body(text) for text in posts] == ["line 1", "line 2", "line 3", "line 4"]
+
+
+def test_same_user_burst_is_merged_into_one_post(listener, monkeypatch):
+    module, calls = listener
+    module.channel_name_cache["C21"] = "cat-agents"
+    monkeypatch.setattr(module, "COALESCE_BURSTS", True)
+
+    posts = post_burst(module, calls, monkeypatch, "C21", [
+        {"ts": f"21.{n}", "user": "U1", "text": f"part {n}", "client_msg_id": f"m-burst-{n}"}
+        for n in range(1, 4)
+    ])
+
+    # The first message is already posting when the rest arrive
+    assert [body(text) for text in posts] == ["part 1", "part 2\npart 3"]
+    assert module.message_tracker[("C21", "21.2")] == module.message_tracker[("C21", "21.3")]
+
+
+def test_bursts_do_not_merge_across_users_or_subtypes(listener, monkeypatch):
+    module, calls = listener
+    module.channel_name_cache["C22"] = "dan-agents"
+    monkeypatch.setattr(module, "COALESCE_BURSTS", True)
+    shared = {"id": "F2", "name": "a.png", "url_private": "https://files.slack.com/F2", "mimetype": "image/png"}
+
+    posts = post_burst(module, calls, monkeypatch, "C22", [
+        {"ts": "22.1", "user": "U1", "text": "first", "client_msg_id": "m-mix-1"},
+        {"ts": "22.2", "user": "U1", "text": "mine", "client_msg_id": "m-mix-2"},
+        {"ts": "22.3", "user": "U2", "text": "theirs", "client_msg_id": "m-mix-3"},
+        {"ts": "22.4", "user": "U2", "text": "a file", "subtype": "file_share", "files": [shared],
+         "client_msg_id": "m-mix-4"},
+        {"ts": "22.5", "user": "U2", "text": "reply", "thread_ts": "22.3", "client_msg_id": "m-mix-5"},
+    ])
+
+    assert [body(text) for text in posts] == ["first", "mine", "theirs", "a file", "reply"]
+
+
+def test_edit_to_one_line_rebuilds_the_merged_post(listener, monkeypatch):
+    module, calls = listener
+    module.channel_name_cache["C23"] = "eve-agents"
+    monkeypatch.setattr(module, "COALESCE_BURSTS", True)
+    post_burst(module, calls, monkeypatch, "C23", [
+        {"ts": f"23.{n}", "user": "U1", "text": f"part {n}", "client_msg_id": f"m-merge-{n}"}
+        for n in range(1, 4)
+    ])
+    merged = module.message_tracker[("C23", "23.2")]
+    del calls[:]
+
+    dispatch(module, {
+        "type": "message",
+        "subtype": "message_changed",
+        "channel": "C23",
+        "ts": "23.9",
+        "event_ts": "23.9",
+        "message": {"type": "message", "ts": "23.3", "user": "U1", "text": "part 3 fixed", "client_msg_id": "m-merge-3"},
+        "previous_message": {"type": "message", "ts": "23.3", "user": "U1", "text": "part 3"},
+    })
+
+    updates = wait_for(calls, "chat.update")
+    assert len(updates) == 1
+    assert updates[0]["ts"] == merged.ts
+    assert body(updates[0]["text"]) == "part 2\npart 3 fixed"
+
+
+def test_concurrent_replies_post_a_missing_parent_once(listener, monkeypatch):
+    module, calls = listener
+    del calls[:]
+
+    def before(method, params):
+        if method == "conversations.replies":
+            time.sleep(0.1)  # Let the other replies pile up behind the lookup
+            return {"messages": [{"ts": "24.0", "user": "U9", "text": "parent"}]}
+
+    monkeypatch.setattr(calls, "before", before)
+    start = threading.Barrier(5)
+
+    def resolve():
+        start.wait()
+        return module._resolve_parent_ts("C24", "24.0", "CAGENT", "fay-agents")
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: resolve(), range(5)))
+
+    posts = [params for name, params in calls if name == "chat.postMessage"]
+    assert [name for name, _ in calls if name == "conversations.replies"] == ["conversations.replies"]
+    assert len(posts) == 1 and body(posts[0]["text"]) == "parent"
+    assert len(set(results)) == 1 and results[0] == module.message_tracker[("C24", "24.0")].ts
+
+
+def test_async_backfill_moves_orphan_reply_under_its_parent(listener, monkeypatch):
+    module, calls = listener
+    del calls[:]
+    module.channel_name_cache["C25"] = "gus-agents"
+    monkeypatch.setattr(module, "THREAD_BACKFILL_ASYNC", True)
+
+    def before(method, params):
+        if method == "conversations.replies":
+            return {"messages": [{"ts": "25.0", "user": "U9", "text": "parent"}]}
+
+    monkeypatch.setattr(calls, "before", before)
+
+    dispatch(module, {"type": "message", "channel": "C25", "ts": "25.1", "event_ts": "25.1", "user": "U1",
+                      "text": "reply", "thread_ts": "25.0", "client_msg_id": "m-orphan"})
+
+    deletes = wait_for(calls, "chat.delete")
+    posts = [params for name, params in calls if name == "chat.postMessage"]
+    orphan, parent, moved = posts
+    assert "thread_ts" not in orphan and body(orphan["text"]) == "reply"
+    assert body(parent["text"]) == "parent"
+    parent_ts = module.message_tracker[("C25", "25.0")].ts
+    assert moved["thread_ts"] == parent_ts and body(moved["text"]) == "reply"
+    # The top-level copy is the first post, answered with ts 900.<its call number>
+    orphan_call = next(n for n, (name, _) in enumerate(calls, 1) if name == "chat.postMessage")
+    assert [(params["channel"], params["ts"]) for params in deletes] == [("CAGENT", f"900.{orphan_call}")]
+    assert module.message_tracker[("C25", "25.1")].ts != f"900.{orphan_call}"
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Batched claim-and-enqueue in the Redis listener, run against an in-process Redis.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+import pytest
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("slack_bolt")
+pytest.importorskip("redis")
+pytest.importorskip("dotenv")
+
+
+@pytest.fixture
+def listener_redis(slack_api, fake_redis, monkeypatch):
+    """core.listener_redis with its claim script loaded on fake_redis and a fresh, unstarted flusher"""
+    from core import listener_redis as module
+    script = fake_redis.register_script(module.CLAIM_AND_ENQUEUE.script)
+    fake_redis.script_load(script.script)
+    monkeypatch.setattr(module, "r", fake_redis)
+    monkeypatch.setattr(module, "CLAIM_AND_ENQUEUE", script)
+    monkeypatch.setattr(module, "pending_jobs", queue.Queue())
+    monkeypatch.setattr(module, "flusher_stop", threading.Event())
+    monkeypatch.setattr(module, "job_flusher_thread",
+                        threading.Thread(target=module.job_flusher, daemon=True, name="job-flusher"))
+    return module
+
+
+def job(module, identifier, channel="C3"):
+    """A queued new-message job, as queue_job would build it"""
+    payload = {"type": "new", "category": "agent", "source_channel_id": channel,
+               "source_channel_name": "bob-agents", "ts": identifier, "text": f"text {identifier}"}
+    key = module.build_fcfs_key("message", channel, identifier)
+    return key, identifier, payload, module.flatten_job(payload)
+
+
+def streamed(module):
+    """The ts field of every job on the stream, in order"""
+    return [fields["ts"] for _, fields in module.r.xrange(module.STREAM_JOBS)]
+
+
+def test_claim_suppresses_duplicate_jobs(listener_redis):
+    module = listener_redis
+
+    module.flush_jobs([job(module, "1.0"), job(module, "1.0"), job(module, "2.0")])
+    module.flush_jobs([job(module, "2.0")])
+
+    assert streamed(module) == ["1.0", "2.0"]
+    assert module.r.get(module.build_fcfs_key("message", "C3", "1.0")) == "1.0"
+
+
+def test_noscript_reloads_and_retries_only_failed_jobs(listener_redis, monkeypatch):
+    module = listener_redis
+    run_claims = module._run_claims
+    batches = []
+
+    def flaky_run_claims(batch):
+        # Redis restarts between the first job and the rest of the first batch
+        batches.append([key for key, _, _, _ in batch])
+        if len(batches) > 1:
+            return run_claims(batch)
+        results = run_claims(batch[:1])
+        module.r.script_flush()
+        return results + run_claims(batch[1:])
+
+    monkeypatch.setattr(module, "_run_claims", flaky_run_claims)
+    jobs = [job(module, "1.0"), job(module, "2.0"), job(module, "3.0")]
+
+    module.flush_jobs(jobs)
+
+    assert batches == [[key for key, _, _, _ in jobs], [key for key, _, _, _ in jobs[1:]]]
+    assert streamed(module) == ["1.0", "2.0", "3.0"]
+
+
+def test_flusher_sends_queued_jobs_as_one_batch(listener_redis, monkeypatch):
+    module = listener_redis
+    batches = []
+    monkeypatch.setattr(module, "flush_jobs", lambda batch: batches.append([ts for _, ts, _, _ in batch]))
+    for identifier in ("1.0", "2.0", "3.0"):
+        module.pending_jobs.put(job(module, identifier))
+
+    module.job_flusher_thread.start()
+    deadline = time.monotonic() + 5
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    module.flush_pending_jobs()
+
+    assert batches == [["1.0", "2.0", "3.0"]]
+
+
+def test_shutdown_waits_for_the_batch_in_hand_then_drains_the_queue(listener_redis, monkeypatch):
+    module = listener_redis
+    flush_jobs = module.flush_jobs
+    flushing, release = threading.Event(), threading.Event()
+
+    def slow_flush_jobs(batch):
+        if not flushing.is_set():
+            flushing.set()
+            release.wait(5)
+        flush_jobs(batch)
+
+    monkeypatch.setattr(module, "flush_jobs", slow_flush_jobs)
+    module.job_flusher_thread.start()
+    module.pending_jobs.put(job(module, "1.0"))
+    assert flushing.wait(5)
+    module.pending_jobs.put(job(module, "2.0"))
+
+    shutdown = threading.Thread(target=module.flush_pending_jobs)
+    shutdown.start()
+    time.sleep(0.1)
+    assert shutdown.is_alive()  # Still joined on the flusher's batch
+    release.set()
+    shutdown.join(5)
+
+    assert not shutdown.is_alive() and not module.job_flusher_thread.is_alive()
+    assert streamed(module) == ["1.0", "2.0"]
+
+
+def test_claim_keys_share_the_stream_slot(listener_redis):
+    from redis.crc import key_slot
+
+    module = listener_redis
+    slot = key_slot(module.STREAM_JOBS.encode())
+
+    for event_type in ("message", "message_changed"):
+        assert key_slot(module.build_fcfs_key(event_type, "C3", "{1.0}").encode()) == slot
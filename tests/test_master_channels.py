@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Master channel validation shared by the listeners.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("slack_sdk")
+
+from slack_sdk.errors import SlackApiError
+
+from utils.master_channels import validate_master_channels
+
+MASTER_CHANNELS = [("Agent", "CAGENT"), ("Apptbk", "CAPPT"), ("Managed admin", "CMAN"), ("Storm admin", "CSTORM")]
+
+
+class FakeClient:
+    def __init__(self, joined, names=None, fail=()):
+        self.joined = joined
+        self.names = names or {}
+        self.fail = fail
+        self.calls = []
+
+    def auth_test(self):
+        self.calls.append("auth.test")
+        return {"user_id": "UBOT"}
+
+    def users_conversations(self, **kwargs):
+        self.calls.append("users.conversations")
+        return {"channels": [{"id": channel_id, "name": name} for channel_id, name in self.joined.items()]}
+
+    def conversations_info(self, channel):
+        self.calls.append("conversations.info")
+        if channel in self.fail:
+            raise SlackApiError("channel_not_found", {"ok": False, "error": "channel_not_found"})
+        return {"channel": {"id": channel, "name": self.names[channel]}}
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+
+
+def test_one_listing_covers_joined_channels():
+    client = FakeClient({"CAGENT": "master-agent", "CAPPT": "master-apptbk", "CMAN": "master-admin", "CSTORM": "master-storm"})
+
+    names = validate_master_channels(client, MASTER_CHANNELS)
+
+    assert names["CSTORM"] == "master-storm"
+    assert client.calls == ["auth.test", "users.conversations"]
+
+
+def test_only_unjoined_channels_are_looked_up():
+    client = FakeClient({"CAGENT": "master-agent", "CAPPT": "master-apptbk"},
+                        names={"CMAN": "master-admin", "CSTORM": "master-storm"})
+
+    names = validate_master_channels(client, MASTER_CHANNELS, get_user_id=lambda: "UBOT")
+
+    assert names == {"CAGENT": "master-agent", "CAPPT": "master-apptbk", "CMAN": "master-admin", "CSTORM": "master-storm"}
+    assert client.calls.count("conversations.info") == 2
+    assert "auth.test" not in client.calls
+
+
+def test_a_fresh_validation_is_reused_without_slack_calls():
+    joined = {"CAGENT": "master-agent", "CAPPT": "master-apptbk", "CMAN": "master-admin", "CSTORM": "master-storm"}
+    validate_master_channels(FakeClient(joined), MASTER_CHANNELS)
+
+    client = FakeClient({})
+    assert validate_master_channels(client, MASTER_CHANNELS) == joined
+    assert client.calls == []
+
+
+def test_an_inaccessible_channel_fails_validation():
+    client = FakeClient({"CAGENT": "master-agent", "CAPPT": "master-apptbk", "CMAN": "master-admin"}, fail=("CSTORM",))
+
+    with pytest.raises(SlackApiError):
+        validate_master_channels(client, MASTER_CHANNELS)
+    assert not os.path.exists("data/master_channels.json")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Pacing behaviour of utils.slack_client.MethodLimiter.
+"""
+
+import io
+import os
+import sys
+from email.message import Message
+from urllib.error import HTTPError
+
+import pytest
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip("slack_sdk")
+
+from utils import slack_client
+from utils.slack_client import MethodLimiter, RateLimitedWebClient
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the limiter's sleeps instead of sleeping"""
+    recorded = []
+    monkeypatch.setattr(slack_client.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_acquire_waits_once_the_bucket_is_empty(sleeps):
+    limiter = MethodLimiter({"conversations.info": (2, 60)})
+    limiter.acquire("conversations.info")
+    limiter.acquire("conversations.info")
+    assert sleeps == []
+
+    limiter.acquire("conversations.info")
+
+    # One token comes back every 30 seconds
+    assert sleeps == [pytest.approx(30, abs=0.1)]
+
+
+def test_acquire_keeps_one_bucket_per_channel(sleeps):
+    limiter = MethodLimiter({"chat.postMessage": (1, 1, "channel")})
+    limiter.acquire("chat.postMessage", "C1")
+    limiter.acquire("chat.postMessage", "C2")
+    assert sleeps == []
+
+    limiter.acquire("chat.postMessage", "C1")
+
+    assert sleeps == [pytest.approx(1, abs=0.1)]
+
+
+def test_unlisted_methods_are_not_paced(sleeps):
+    limiter = MethodLimiter({})
+    for _ in range(5):
+        limiter.acquire("auth.test")
+    limiter.pause("auth.test", None, 30)
+    limiter.acquire("auth.test")
+
+    assert sleeps == []
+
+
+def test_pause_holds_the_next_caller(sleeps):
+    limiter = MethodLimiter({"chat.update": (60, 60)})
+
+    limiter.pause("chat.update", None, 5)
+    limiter.acquire("chat.update")
+
+    assert sleeps == [pytest.approx(5, abs=0.1)]
+
+
+def test_pause_only_holds_its_own_channel(sleeps):
+    limiter = MethodLimiter({"chat.postMessage": (1, 1, "channel")})
+
+    limiter.pause("chat.postMessage", "C1", 3)
+    limiter.acquire("chat.postMessage", "C2")
+    assert sleeps == []
+
+    limiter.acquire("chat.postMessage", "C1")
+    assert sleeps == [pytest.approx(3, abs=0.1)]
+
+
+def test_rate_limited_without_a_call_in_flight_is_ignored(sleeps):
+    client = RateLimitedWebClient(token="xoxb-test", limiter=MethodLimiter({"chat.update": (60, 60)}))
+
+    client.rate_limited(5)
+    client.limiter.acquire("chat.update")
+
+    assert sleeps == []
+
+
+def http_error(url, status):
+    """The HTTPError urllib raises for a non-2xx answer"""
+    return HTTPError(url, status, "Server Error", Message(), io.BytesIO(b""))
+
+
+def test_client_retries_transient_slack_errors(sleeps, monkeypatch):
+    client = slack_client.create_web_client("xoxb-test")
+    client.limiter = MethodLimiter({})
+    answers = [
+        {"status": 500, "headers": {}, "body": ""},
+        {"status": 200, "headers": {}, "body": '{"ok": false, "error": "internal_error"}'},
+        {"status": 200, "headers": {}, "body": '{"ok": true, "ts": "1.0"}'},
+    ]
+
+    def perform(url, req):
+        answer = answers.pop(0)
+        if answer["status"] >= 500:
+            raise http_error(url, answer["status"])
+        return answer
+
+    monkeypatch.setattr(client, "_perform_urllib_http_request_internal", perform)
+
+    assert client.chat_postMessage(channel="C1", text="hi")["ts"] == "1.0"
+    # Backed off 1s, then 2s (before jitter)
+    assert len(sleeps) == 2 and 1 <= sleeps[0] < 2 <= sleeps[1] < 3
+
+
+def test_rate_limited_after_a_finished_call_is_ignored(sleeps, monkeypatch):
+    client = RateLimitedWebClient(token="xoxb-test", limiter=MethodLimiter({"chat.update": (60, 60)}))
+    monkeypatch.setattr(client, "_perform_urllib_http_request_internal",
+                        lambda url, req: {"status": 200, "headers": {}, "body": '{"ok": true}'})
+    client.chat_update(channel="C1", ts="1.0", text="hi")
+
+    # A 429 on this thread from a request that bypassed api_call
+    client.rate_limited(5)
+    client.limiter.acquire("chat.update")
+
+    assert sleeps == []